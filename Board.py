@@ -1,9 +1,13 @@
+from cache import LRUCache
 from checkers import Man, King
+from evaluation import evaluate
+from geometry import board_layout, diagonal_table, parse_board_size, rotate_move
+from zobrist import rotated_zobrist_table, zobrist_table, SIDE_KEY
 import copy
 
 class Board:
     """
-    Represents the game state of a 4x4 checkers game.
+    Represents the game state of a checkers game on any even NxN board (4x4, 8x8, 10x10, ...).
 
     Responsibilities:
     - Maintains the 2D board and active pieces
@@ -14,82 +18,124 @@ class Board:
         white_pieces (list): List of all white pieces on the board.
         black_pieces (list): List of all black pieces on the board.
         last_move_color (str): Color ('white' or 'black') of the player who made the last move.
+        size (int): Number of rows (and columns) of the board.
         board (list of lists): 2D array representing the game board.
         no_progress_counter (int): Counter tracking number of moves without capture or promotion.
+        hash (int): Zobrist hash of the position (pieces and side to move), updated by move_piece.
+        rotated_hash (int): Zobrist hash of the same position rotated by 180 degrees with
+            the colors swapped, also updated by move_piece (see canonical_key).
+        history (list): Hashes of every position reached so far, oldest first. Board copies
+            made during search extend it, so it also covers the current search path.
+        move_cache (LRUCache): Class-wide cache of move lists keyed on canonical_key and color.
+            Replace it with a differently sized LRUCache, or use maxsize=0 to disable it.
     """
-    def __init__(self, board = '8x8'):
+    move_cache = LRUCache(maxsize=200_000)
+
+    def __init__(self, board = '8x8', start_rows=None):
+        """
+        Args:
+            board (str or int): Board size such as '4x4', '8x8' or '10x10'.
+            start_rows (int or None): Rows of men per side; defaults to the standard layout
+                for the size (see geometry.board_layout).
+
+        Raises:
+            ValueError: If the size is unsupported or start_rows would leave the two sides
+                without at least one empty row between them.
+        """
         self.white_pieces = []
         self.black_pieces = []
         self.last_move_color = 'black'
 
-        if board == '4x4':
-            self.board = self.create_board_4x4()
-        elif board == '8x8':
-            self.board = self.create_board_8x8()
+        self.size = parse_board_size(board)
+        default_rows, parity = board_layout(self.size)
+        if start_rows is None:
+            start_rows = default_rows
+        elif not 1 <= start_rows < self.size // 2:
+            raise ValueError(f"start_rows must be between 1 and {self.size // 2 - 1} on a "
+                             f"{self.size}x{self.size} board, got {start_rows}")
+        self.board = self.create_board(self.size, start_rows, parity)
 
         self.no_progress_counter = 0 # For detecting draw by inactivity
+        self.hash = self.compute_hash()
+        self.rotated_hash = self.compute_hash(rotated=True)
+        self.history = [self.hash]
 
-    def create_board_4x4(self) -> list:
-        """
-        Initializes a 4x4 board with two white and two black pieces in starting positions.
-         Returns:
-            list: The initialized 4x4 board.
+    def create_board(self, size, start_rows, parity) -> list:
         """
-        board = [[None for _ in range(4)] for _ in range(4)]
+        Initializes a size x size board with each side's men filling its first start_rows rows.
 
-        # Place white pieces
-        for col in [0, 2]:
-            man = Man('white', (0, col), self)
-            board[0][col] = man
-            self.white_pieces.append(man)
-
-        # Place black pieces
-        for col in [1, 3]:
-            man = Man('black', (3, col), self)
-            board[3][col] = man
-            self.black_pieces.append(man)
-
-        return board
+        Args:
+            size (int): Number of rows and columns.
+            start_rows (int): Rows of men per side.
+            parity (int): Pieces stand on squares where (row + col) % 2 == parity.
 
-    def create_board_8x8(self) -> list:
-        """
-        Initializes a 8x8 board with two white and two black pieces in starting positions.
-         Returns:
-            list: The initialized 8x8 board.
+        Returns:
+            list: The initialized board.
         """
-        board = [[None for _ in range(8)] for _ in range(8)]
+        board = [[None for _ in range(size)] for _ in range(size)]
 
         # Place white pieces
-        for row in range(3):
-            for col in range(8):
-                if (row + col) % 2 == 1:
+        for row in range(start_rows):
+            for col in range(size):
+                if (row + col) % 2 == parity:
                     man = Man('white', (row, col), self)
                     board[row][col] = man
                     self.white_pieces.append(man)
 
         # Place black pieces
-        for row in range(5, 8):
-            for col in range(8):
-                if (row + col) % 2 == 1:
+        for row in range(size - start_rows, size):
+            for col in range(size):
+                if (row + col) % 2 == parity:
                     man = Man('black', (row, col), self)
                     board[row][col] = man
                     self.black_pieces.append(man)
 
         return board
 
-    def move_piece(self, start_pos, end_pos):
+    def compute_hash(self, rotated=False) -> int:
+        """
+        Computes the Zobrist hash of the current position from scratch.
+
+        move_piece keeps `hash` and `rotated_hash` up to date incrementally; call this (and
+        assign the results, resetting `history`) only after editing `board` directly.
+
+        Args:
+            rotated (bool): Hash the rotated, color-swapped position instead.
+
+        Returns:
+            int: 64-bit position hash.
+        """
+        if rotated:
+            table = rotated_zobrist_table(len(self.board))
+            h = SIDE_KEY if self.last_move_color == 'black' else 0
+        else:
+            table = zobrist_table(len(self.board))
+            h = SIDE_KEY if self.last_move_color == 'white' else 0
+        for row in self.board:
+            for piece in row:
+                if piece:
+                    h ^= table[(piece.color, piece.is_king)][piece.position[0]][piece.position[1]]
+        return h
+
+    def move_piece(self, start_pos, end_pos, path=None):
         """
         Attempts to move a piece from start_pos to end_pos.
+
+        A capture chain is played as a single move. If several legal chains lead from
+        start_pos to end_pos, `path` selects one; otherwise the first is played.
+
         Args:
             start_pos (tuple): (row, col) of the starting position.
             end_pos (tuple): (row, col) of the ending position.
+            path (tuple or None): Full move as returned by get_all_moves.
 
         Returns:
             dict: A dictionary with keys:
                 - 'moved' (bool): Whether the move was successful.
                 - 'start' (tuple): Starting position.
                 - 'end' (tuple): Ending position.
-                - 'captured' (Piece or None): Captured piece, if any.
+                - 'path' (tuple or None): Every square visited, from start to end.
+                - 'captured' (list): Captured pieces, in capture order.
                 - 'promoted' (Piece or None): Promoted piece, if any.
                 - 'game_over_text' (str or None): Game over message, if game ends.
         """
@@ -97,7 +143,8 @@ class Board:
             "moved": False,
             "start": start_pos,
             "end": end_pos,
-            "captured": None,
+            "path": None,
+            "captured": [],
             "promoted": None,
             "game_over_text": None
         }
@@ -113,50 +160,64 @@ class Board:
         if self.last_move_color == start_piece.color:
             print("Not your turn.")
             return result
-        if not start_piece.is_legal_move(end_pos, self.board):
+        move = self.find_move(start_piece.color, start_pos, end_pos, path)
+        if move is None:
             print("Illegal move.")
             return result
 
         result["moved"] = True
-
-        # Handle capture
-        if abs(end_row - start_row) == 2 and abs(end_col - start_col) == 2:
-            mid_row = (start_row + end_row) // 2
-            mid_col = (start_col + end_col) // 2
+        result["path"] = move
+        table = zobrist_table(len(self.board))
+        rotated = rotated_zobrist_table(len(self.board))
+
+        # Handle captures: every hop of the chain jumps over one piece
+        for (from_row, from_col), (to_row, to_col) in zip(move, move[1:]):
+            if abs(to_row - from_row) != 2:
+                break
+            mid_row = (from_row + to_row) // 2
+            mid_col = (from_col + to_col) // 2
             captured = self.board[mid_row][mid_col]
-            if captured:
-                if captured.color == 'white':
-                    self.white_pieces.remove(captured)
-                else:
-                    self.black_pieces.remove(captured)
-                self.board[mid_row][mid_col] = None
-                result["captured"] = captured
-
-        # Move piece
-        self.board[end_row][end_col] = start_piece
+            if captured.color == 'white':
+                self.white_pieces.remove(captured)
+            else:
+                self.black_pieces.remove(captured)
+            self.board[mid_row][mid_col] = None
+            self.hash ^= table[(captured.color, captured.is_king)][mid_row][mid_col]
+            self.rotated_hash ^= rotated[(captured.color, captured.is_king)][mid_row][mid_col]
+            result["captured"].append(captured)
+
+        # Move piece (a capture chain may end on its own start square)
         self.board[start_row][start_col] = None
+        self.board[end_row][end_col] = start_piece
         start_piece.position = (end_row, end_col)
+        piece_keys = table[(start_piece.color, start_piece.is_king)]
+        self.hash ^= piece_keys[start_row][start_col] ^ piece_keys[end_row][end_col]
+        rotated_keys = rotated[(start_piece.color, start_piece.is_king)]
+        self.rotated_hash ^= rotated_keys[start_row][start_col] ^ rotated_keys[end_row][end_col]
 
         # Handle promotion
         if isinstance(start_piece, Man):
-            should_promote = (
-                    (start_piece.color == "black" and end_row == 0) or
-                    (start_piece.color == "white" and end_row == len(self.board) - 1)
-            )
-            if should_promote:
+            if self.promotes(start_piece, end_row):
                 promoted_king = King(start_piece.color, (end_row, end_col), self)
                 self.board[end_row][end_col] = promoted_king
+                self.hash ^= piece_keys[end_row][end_col] ^ table[(promoted_king.color, True)][end_row][end_col]
+                self.rotated_hash ^= rotated_keys[end_row][end_col] ^ rotated[(promoted_king.color, True)][end_row][end_col]
                 result["promoted"] = promoted_king
                 piece_list = self.white_pieces if start_piece.color == 'white' else self.black_pieces
                 piece_list.remove(start_piece)
                 piece_list.append(promoted_king)
 
         self.last_move_color = start_piece.color
+        self.hash ^= SIDE_KEY
+        self.rotated_hash ^= SIDE_KEY
+        self.history.append(self.hash)
 
         # Game state checks
         if self.game_over():
             winner = 'white' if self.white_pieces else 'black'
             result["game_over_text"] = f"{winner} won!"
+        elif self.repetition_count() >= 2:
+            result["game_over_text"] = "Draw by repetition!"
         elif self.draw():
             result["game_over_text"] = "Draw!"
 
@@ -168,6 +229,35 @@ class Board:
 
         return result
 
+    def promotes(self, piece, row) -> bool:
+        """
+        Checks whether a piece arriving on the given row is crowned.
+
+        Args:
+            piece (Piece): The moving piece.
+            row (int): Destination row.
+
+        Returns:
+            bool: True if a Man reaches the opponent's back row.
+        """
+        if piece.is_king:
+            return False
+        return row == (0 if piece.color == 'black' else len(self.board) - 1)
+
+    def find_move(self, color, start_pos, end_pos, path=None):
+        """
+        Finds the legal move of `color` matching a start and end square (and path, if given).
+
+        Returns:
+            tuple or None: The matching move from get_all_moves, or None if it is illegal.
+        """
+        if path is not None:
+            path = tuple(tuple(square) for square in path)
+        for move in self.get_all_moves(color):
+            if move[0] == tuple(start_pos) and move[-1] == tuple(end_pos) and path in (None, move):
+                return move
+        return None
+
     def print_board(self):
         """
         Prints the current board state to the console.
@@ -176,35 +266,89 @@ class Board:
             print(' '.join(str(piece) if piece else '..' for piece in row))
         print()
 
-    def evaluate_board(self) -> int:
+    def evaluate_board(self) -> float:
         """
         Evaluates the board score from white's perspective.
 
+        Uses the weights loaded by the evaluation module (man = 1, king = 2 unless a
+        tuned weights file is present).
+
         Returns:
-            int: Positive score favors white, negative favors black.
+            float: Positive score favors white, negative favors black.
         """
-        score = 0
-        for row in self.board:
-            for piece in row:
-                if piece is None:
-                    continue
-                value = 2 if isinstance(piece, King) else 1
-                score += value if piece.color == 'white' else -value
-        return score
+        return evaluate(self)
 
     def get_all_moves(self, color) -> list:
         """
         Gets all legal moves for a given color.
 
+        Results are served from `move_cache` when the position, or its rotated
+        counterpart, has been seen before.
+
         Args:
             color (str): 'white' or 'black'
 
         Returns:
-            list of tuples: Each move is ((start_row, start_col), (end_row, end_col))
+            list of tuples: Each move is the sequence of squares it visits,
+            ((start_row, start_col), ..., (end_row, end_col))
+        """
+        (size, h), rotated = self.canonical_key()
+        if rotated:
+            # Cached as the other color's moves in the rotated position
+            key = (size, h, 'black' if color == 'white' else 'white')
+            moves = self.move_cache.get(key)
+            if moves is None:
+                moves = self.generate_moves(color)
+                self.move_cache.put(key, tuple(rotate_move(move, size) for move in moves))
+                return moves
+            return [rotate_move(move, size) for move in moves]
+
+        key = (size, h, color)
+        moves = self.move_cache.get(key)
+        if moves is None:
+            moves = tuple(self.generate_moves(color))
+            self.move_cache.put(key, moves)
+        return list(moves)
+
+    def canonical_key(self) -> tuple:
+        """
+        Returns a key shared by this position and its rotated, color-swapped counterpart,
+        so tables keyed on it store each such pair once.
+
+        When `rotated` is True, data stored under the key describes the counterpart: colors
+        are swapped, scores change sign and moves map back with geometry.rotate_move.
+
+        Returns:
+            tuple: ((board size, canonical hash), rotated)
+        """
+        if self.rotated_hash < self.hash:
+            return (len(self.board), self.rotated_hash), True
+        return (len(self.board), self.hash), False
+
+    def generate_moves(self, color) -> list:
+        """
+        Generates all legal moves for a given color without consulting the move cache.
+
+        Capturing is mandatory: if any piece of `color` can capture, only complete capture
+        chains are returned. A chain ends when no further jump is possible or when a Man
+        is crowned.
+
+        Args:
+            color (str): 'white' or 'black'
+
+        Returns:
+            list of tuples: Each move is the sequence of squares it visits,
+            ((start_row, start_col), ..., (end_row, end_col))
         """
-        moves = []
         pieces = self.white_pieces if color == 'white' else self.black_pieces
 
+        captures = []
+        for piece in pieces:
+            captures.extend(self.capture_sequences(piece))
+        if captures:
+            return captures
+
+        moves = []
         for piece in pieces:
             start_pos = piece.position
             for end_pos in piece.get_legal_moves(self.board):
@@ -212,6 +356,50 @@ class Board:
 
         return moves
 
+    def capture_sequences(self, piece) -> list:
+        """
+        Finds every complete capture chain for a piece with a depth-first search over jumps.
+
+        Captured pieces stay on the board until the move is played, so each piece can be
+        jumped at most once, and the moving piece's start square counts as empty.
+
+        Args:
+            piece (Piece): The piece to move.
+
+        Returns:
+            list of tuples: Each chain as the sequence of squares visited.
+        """
+        board = self.board
+        table = diagonal_table(len(board))
+        start = piece.position
+        sequences = []
+
+        def extend(path, captured):
+            row, col = path[-1]
+            neighbours = table[row][col]
+            extended = False
+            for direction in piece.directions:
+                mid, land = neighbours[direction]
+                if land is None:
+                    continue
+                mid_piece = board[mid[0]][mid[1]]
+                if mid_piece is None or mid_piece.color == piece.color or mid in captured:
+                    continue
+                if board[land[0]][land[1]] is not None and land != start:
+                    continue
+
+                extended = True
+                new_path = path + (land,)
+                if self.promotes(piece, land[0]):
+                    sequences.append(new_path)  # Crowning ends the move
+                else:
+                    extend(new_path, captured | {mid})
+            if not extended and len(path) > 1:
+                sequences.append(path)
+
+        extend((start,), frozenset())
+        return sequences
+
     def game_over(self):
         """
         Checks whether the game is over (one player has no pieces).
@@ -223,7 +411,7 @@ class Board:
 
     def draw(self) -> bool:
         """
-        Determines if the game is a draw (no legal moves or stagnation).
+        Determines if the game is a draw (no legal moves, threefold repetition or stagnation).
 
         Returns:
             bool: True if draw.
@@ -231,8 +419,33 @@ class Board:
         if (not self.get_all_moves('white') and self.last_move_color == 'black') or \
                 (not self.get_all_moves('black') and self.last_move_color == 'white'):
             return True
+        if self.repetition_count() >= 2:
+            return True
         return self.no_progress_counter >= 20
 
+    def repetition_count(self) -> int:
+        """
+        Counts earlier occurrences of the current position in `history`.
+
+        Only positions since the last capture or promotion can repeat, and only those with
+        the same side to move, so the scan looks back at most no_progress_counter + 1 plies
+        in steps of two.
+
+        Returns:
+            int: Number of times the current position occurred before.
+        """
+        history = self.history
+        current = history[-1]
+        oldest = max(0, len(history) - self.no_progress_counter - 2)
+        return sum(1 for i in range(len(history) - 3, oldest - 1, -2) if history[i] == current)
+
+    def is_repetition(self) -> bool:
+        """
+        Returns:
+            bool: True if the current position occurred before in the game or search path.
+        """
+        return self.repetition_count() > 0
+
     def copy(self):
         """
         Returns a deep copy of the board.
@@ -0,0 +1,310 @@
+"""
+Performance benchmarks for the checkers engine.
+
+Usage:
+    python benchmark.py movecache
+    python benchmark.py perft --depth 6
+    python benchmark.py selective --games 10
+    python benchmark.py scaling --sizes 4 8 10 12
+"""
+from Board import Board
+from cache import LRUCache
+from game_record import result_from_text
+from minimax import get_ai_move
+import argparse
+import random
+import time
+
+# (board size, search depth) pairs used by the GUI
+GUI_SEARCHES = [('4x4', 15), ('8x8', 7)]
+
+# Published move-path counts from the 8x8 starting position (English draughts)
+PERFT_8X8 = [1, 7, 49, 302, 1469, 7361, 36768, 179740, 845931, 3963680]
+
+
+def time_search(board_size, depth, repeat=1):
+    """
+    Times get_ai_move from the starting position.
+
+    Args:
+        board_size (str): '4x4' or '8x8'.
+        depth (int): Search depth.
+        repeat (int): Number of successive searches, mimicking consecutive AI turns
+            that see the same positions again.
+
+    Returns:
+        tuple: (total seconds, best move of the last search)
+    """
+    start = time.perf_counter()
+    move = None
+    for _ in range(repeat):
+        move = get_ai_move(Board(board=board_size), depth=depth)
+    return time.perf_counter() - start, move
+
+
+def bench_move_cache(repeat=2, maxsize=200_000):
+    """
+    Compares search time with the move-generation cache disabled and enabled.
+    """
+    original = Board.move_cache
+    try:
+        for board_size, depth in GUI_SEARCHES:
+            Board.move_cache = LRUCache(maxsize=0)
+            cold, cold_move = time_search(board_size, depth, repeat)
+
+            Board.move_cache = LRUCache(maxsize=maxsize)
+            warm, warm_move = time_search(board_size, depth, repeat)
+            stats = Board.move_cache.stats()
+
+            print(f"{board_size} depth {depth} x{repeat}: "
+                  f"no cache {cold:.2f}s, cache {warm:.2f}s ({cold / warm:.2f}x), "
+                  f"hit rate {stats['hit_rate']:.1%}, {stats['size']} entries")
+            if cold_move != warm_move:
+                print(f"  warning: best move differs ({cold_move} vs {warm_move})")
+    finally:
+        Board.move_cache = original
+
+
+def perft(board, depth) -> int:
+    """
+    Counts the leaf nodes of the full move tree, treating each capture chain as one move.
+
+    Args:
+        board (Board): Position to start from.
+        depth (int): Number of plies.
+
+    Returns:
+        int: Number of distinct move sequences of length `depth`.
+    """
+    if depth == 0:
+        return 1
+    color = 'black' if board.last_move_color == 'white' else 'white'
+    moves = board.get_all_moves(color)
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        new_board = board.copy()
+        new_board.move_piece(move[0], move[-1], path=move)
+        nodes += perft(new_board, depth - 1)
+    return nodes
+
+
+def bench_perft(max_depth=6):
+    """
+    Runs perft from the 8x8 starting position and checks it against the published counts.
+
+    Returns:
+        bool: True if every depth with a published count matched.
+    """
+    ok = True
+    for depth in range(1, max_depth + 1):
+        start = time.perf_counter()
+        nodes = perft(Board(board='8x8'), depth)
+        elapsed = time.perf_counter() - start
+        expected = PERFT_8X8[depth] if depth < len(PERFT_8X8) else None
+        if expected is None:
+            status = ''
+        elif nodes == expected:
+            status = 'ok'
+        else:
+            status = f'MISMATCH (expected {expected})'
+            ok = False
+        print(f"perft({depth}) = {nodes:>8} {elapsed:6.2f}s {status}")
+    return ok
+
+
+# Selective-search configurations compared by bench_selective
+SELECTIVE_CONFIGS = {
+    "full width": {},
+    "lmr": {"lmr": True},
+    "futility": {"futility": True},
+    "lmr + futility": {"lmr": True, "futility": True},
+    "lmr, no re-search": {"lmr": True, "research": False},
+}
+
+
+def random_opening(board_size, plies, rng) -> Board:
+    """
+    Plays random legal moves from the starting position to diversify test games.
+    """
+    board = Board(board=board_size)
+    for _ in range(plies):
+        color = 'black' if board.last_move_color == 'white' else 'white'
+        moves = board.get_all_moves(color)
+        if not moves or board.game_over():
+            break
+        move = rng.choice(moves)
+        board.move_piece(move[0], move[-1], path=move)
+    return board
+
+
+def play_game(board, white, black, max_plies=150):
+    """
+    Plays a game between two engine configurations.
+
+    Args:
+        board (Board): Starting position; it is modified in place.
+        white (dict): get_ai_move keyword arguments for white (including depth).
+        black (dict): get_ai_move keyword arguments for black.
+        max_plies (int): Plies after which the game is adjudicated a draw.
+
+    Returns:
+        tuple: (PDN result token, {color: [seconds per move]})
+    """
+    times = {'white': [], 'black': []}
+    for _ in range(max_plies):
+        color = 'black' if board.last_move_color == 'white' else 'white'
+        start = time.perf_counter()
+        move = get_ai_move(board, **(white if color == 'white' else black))
+        times[color].append(time.perf_counter() - start)
+        if move is None:
+            break
+        result = board.move_piece(move[0], move[-1], path=move)
+        if result["game_over_text"]:
+            return result_from_text(result["game_over_text"]), times
+    return result_from_text("Draw!"), times
+
+
+def bench_selective(board_size='8x8', depth=5, games=10, positions=6, seed=1):
+    """
+    Measures the selective-search features.
+
+    First times every configuration in SELECTIVE_CONFIGS at a fixed depth over a set of
+    random openings, each starting with an empty move cache. Then plays `games` self-play
+    games (alternating colors) between the LMR + futility engine searching one ply deeper
+    and the full-width engine.
+    """
+    rng = random.Random(seed)
+    openings = [random_opening(board_size, rng.randint(2, 8), rng) for _ in range(positions)]
+
+    print(f"{board_size}, depth {depth}, {positions} positions:")
+    for name, features in SELECTIVE_CONFIGS.items():
+        Board.move_cache.clear()  # Every configuration starts cold
+        start = time.perf_counter()
+        for board in openings:
+            get_ai_move(board, depth=depth, **features)
+        print(f"  {name:<18} {time.perf_counter() - start:6.2f}s")
+
+    selective = {"depth": depth + 1, "lmr": True, "futility": True}
+    full_width = {"depth": depth}
+    outcomes = {'win': 0, 'draw': 0, 'loss': 0}
+    selective_times, full_width_times = [], []
+    for game in range(games):
+        if game % 2 == 0:
+            opening = random_opening(board_size, rng.randint(2, 8), rng)
+        board = opening.copy()  # Each opening is played once with each color
+        selective_is_white = game % 2 == 0
+        white, black = (selective, full_width) if selective_is_white else (full_width, selective)
+        result, times = play_game(board, white, black)
+        points = {'1-0': 1.0, '0-1': 0.0}.get(result, 0.5)
+        points = points if selective_is_white else 1 - points
+        outcomes[{1.0: 'win', 0.5: 'draw', 0.0: 'loss'}[points]] += 1
+        selective_times += times['white' if selective_is_white else 'black']
+        full_width_times += times['black' if selective_is_white else 'white']
+
+    def average(values):
+        return sum(values) / len(values) if values else 0.0
+
+    print(f"Self-play, selective depth {depth + 1} vs full width depth {depth}: "
+          f"+{outcomes['win']} ={outcomes['draw']} -{outcomes['loss']} for selective, "
+          f"{average(selective_times):.2f}s vs {average(full_width_times):.2f}s per move")
+
+
+def count_nodes(func, *args, **kwargs):
+    """
+    Calls func and counts the positions it creates with Board.copy (one per searched node).
+
+    Returns:
+        tuple: (return value of func, number of copies)
+    """
+    original = Board.copy
+    nodes = 0
+
+    def counting_copy(board):
+        nonlocal nodes
+        nodes += 1
+        return original(board)
+
+    Board.copy = counting_copy
+    try:
+        return func(*args, **kwargs), nodes
+    finally:
+        Board.copy = original
+
+
+def bench_scaling(sizes=(4, 8, 10, 12), depth=4, positions=5, seed=1):
+    """
+    Reports move-generation and search throughput for each board size.
+
+    Move generation is measured with the uncached generator over positions sampled from
+    random games; search throughput is nodes per second for a fixed-depth search from
+    random openings.
+    """
+    original = Board.move_cache
+    Board.move_cache = LRUCache(maxsize=0)  # Measure generation, not cache hits
+    try:
+        print(f"{'board':>7} {'pieces':>6} {'moves/pos':>9} {'gen/s':>9} {'nodes':>8} {'nodes/s':>8} {'search':>8}")
+        for size in sizes:
+            rng = random.Random(seed)
+            board_size = f"{size}x{size}"
+            samples = [random_opening(board_size, rng.randint(0, 4 * size), rng) for _ in range(20)]
+            colors = ['black' if board.last_move_color == 'white' else 'white' for board in samples]
+
+            calls = 0
+            generated = 0
+            start = time.perf_counter()
+            while time.perf_counter() - start < 1.0:
+                for board, color in zip(samples, colors):
+                    generated += len(board.generate_moves(color))
+                    calls += 1
+            generation_rate = calls / (time.perf_counter() - start)
+
+            nodes = 0
+            start = time.perf_counter()
+            for _ in range(positions):
+                _, searched = count_nodes(get_ai_move, random_opening(board_size, rng.randint(2, 6), rng), depth=depth)
+                nodes += searched
+            elapsed = time.perf_counter() - start
+
+            pieces = len(Board(board=board_size).white_pieces) * 2
+            print(f"{board_size:>7} {pieces:>6} {generated / calls:>9.1f} {generation_rate:>9.0f} "
+                  f"{nodes:>8} {nodes / elapsed:>8.0f} {elapsed:>7.2f}s")
+    finally:
+        Board.move_cache = original
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    movecache = commands.add_parser('movecache', help="move-generation cache on/off")
+    movecache.add_argument('--repeat', type=int, default=2)
+    movecache.add_argument('--maxsize', type=int, default=200_000)
+
+    perft_parser = commands.add_parser('perft', help="validate move generation against known counts")
+    perft_parser.add_argument('--depth', type=int, default=6)
+
+    selective = commands.add_parser('selective', help="late move reductions and futility pruning")
+    selective.add_argument('--board', default='8x8')
+    selective.add_argument('--depth', type=int, default=5)
+    selective.add_argument('--games', type=int, default=10)
+    selective.add_argument('--seed', type=int, default=1)
+
+    scaling = commands.add_parser('scaling', help="throughput across board sizes")
+    scaling.add_argument('--sizes', type=int, nargs='+', default=[4, 8, 10, 12])
+    scaling.add_argument('--depth', type=int, default=4)
+
+    args = parser.parse_args()
+    if args.command == 'movecache':
+        bench_move_cache(repeat=args.repeat, maxsize=args.maxsize)
+    elif args.command == 'perft':
+        raise SystemExit(0 if bench_perft(args.depth) else 1)
+    elif args.command == 'selective':
+        bench_selective(board_size=args.board, depth=args.depth, games=args.games, seed=args.seed)
+    elif args.command == 'scaling':
+        bench_scaling(sizes=args.sizes, depth=args.depth)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+from collections import OrderedDict
+import os
+import sys
+
+# Approximate bytes an OrderedDict spends per entry besides the key and value objects
+_ENTRY_OVERHEAD = 100
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    A size-bounded mapping that evicts the least recently used entry when full.
+
+    Attributes:
+        maxsize (int): Maximum number of entries. 0 disables the cache.
+        hits (int): Number of successful lookups.
+        misses (int): Number of failed lookups.
+        bytes (int): Estimated memory held by the entries, kept up to date as they are
+            stored and evicted.
+    """
+
+    def __init__(self, maxsize=100_000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        """
+        Looks up a key and marks it as most recently used.
+
+        Returns:
+            The cached value, or `default` if the key is not cached.
+        """
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key, value):
+        self.put(key, value)
+
+    def put(self, key, value):
+        """
+        Stores a value, evicting the least recently used entries if the cache is full.
+        """
+        if self.maxsize <= 0:
+            return
+        old = self._data.pop(key, _MISSING)
+        if old is not _MISSING:
+            self.bytes -= _owned_sizeof(old)
+        else:
+            self.bytes += _ENTRY_OVERHEAD + _owned_sizeof(key)
+        self._data[key] = value
+        self.bytes += _owned_sizeof(value)
+        self.trim(self.maxsize)
+
+    def resize(self, maxsize):
+        """
+        Changes the size bound, evicting entries if the cache shrinks.
+        """
+        self.maxsize = maxsize
+        self.trim(maxsize)
+
+    def trim(self, size):
+        """
+        Evicts least recently used entries until at most `size` remain, keeping maxsize.
+        """
+        while len(self._data) > max(size, 0):
+            key, value = self._data.popitem(last=False)
+            self.bytes -= _ENTRY_OVERHEAD + _owned_sizeof(key) + _owned_sizeof(value)
+
+    def clear(self):
+        """Removes all entries and resets the statistics."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: hits, misses, hit_rate, size and maxsize.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+
+def _is_square(value) -> bool:
+    """Checks whether a value looks like a (row, col) square."""
+    return type(value) is tuple and len(value) == 2 and all(type(i) is int and 0 <= i <= 256 for i in value)
+
+
+def _owned_sizeof(value) -> int:
+    """
+    Size of the objects a cache entry owns.
+
+    Small ints and strings are shared by the interpreter, and the squares a move lands on
+    are shared with the precomputed diagonal tables, so neither is counted. A move's start
+    square is the moving piece's position, usually created during the search, so it is.
+    """
+    if isinstance(value, tuple):
+        if value and all(_is_square(item) for item in value):
+            return sys.getsizeof(value) + sys.getsizeof(value[0])  # A move
+        return sys.getsizeof(value) + sum(_owned_sizeof(item) for item in value)
+    if isinstance(value, list):
+        return sys.getsizeof(value) + sum(_owned_sizeof(item) for item in value)
+    if isinstance(value, float) or (type(value) is int and not -5 <= value <= 256):
+        return sys.getsizeof(value)
+    return 0
+
+
+def resident_memory():
+    """
+    Returns:
+        int or None: Resident set size of this process in bytes; the peak size where the
+        current one is not available, or None on platforms without either.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024  # Linux reports KiB
+
+
+class MemoryGovernor:
+    """
+    Keeps several LRU caches within one shared memory budget.
+
+    The caches keep their estimated sizes up to date on every insertion, so checking the
+    total is cheap enough to do after every search node. When it exceeds `max_bytes`,
+    every cache evicts its least recently used entries in proportion to its share of the
+    total, down to `low_water` of the budget so that the next few checks do not evict again.
+
+    Attributes:
+        max_bytes (int): Budget for all caches together.
+        caches (dict): Name to LRUCache, or to a callable returning the LRUCache currently
+            in use, for caches that may be replaced (such as Board.move_cache).
+        low_water (float): Fraction of the budget the caches are trimmed to.
+        evictions (int): Entries evicted so far.
+    """
+
+    def __init__(self, max_bytes, caches, low_water=0.9):
+        self.max_bytes = max_bytes
+        self.caches = caches
+        self.low_water = low_water
+        self.evictions = 0
+
+    def usage(self) -> dict:
+        """
+        Returns:
+            dict: Estimated bytes held by each cache.
+        """
+        return {name: cache.bytes for name, cache in self._current().items()}
+
+    def enforce(self):
+        """
+        Evicts entries if the caches are over budget.
+        """
+        caches = self._current()
+        total = sum(cache.bytes for cache in caches.values())
+        if total <= self.max_bytes:
+            return
+        keep = self.max_bytes * self.low_water / total
+        for cache in caches.values():
+            before = len(cache)
+            cache.trim(int(before * keep))
+            self.evictions += before - len(cache)
+
+    def _current(self) -> dict:
+        """Resolves the caches given as callables to the ones currently in use."""
+        return {name: cache() if callable(cache) else cache for name, cache in self.caches.items()}
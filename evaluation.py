@@ -0,0 +1,135 @@
+"""
+Linear evaluation over a small set of board features.
+
+Weights are loaded once at import time from the file named by the CHECKERS_WEIGHTS
+environment variable, or from weights.json next to this module if it exists. Without a
+weights file the evaluation is plain material: man = 1, king = 2. tuner.py fits weights
+from game records and writes files in the format read here.
+"""
+import hashlib
+import json
+import os
+
+# Every feature is counted for white minus black
+FEATURES = [
+    'man',          # Men on the board
+    'king',         # Kings on the board
+    'advancement',  # Rows advanced by men, in units of the full board length
+    'back_row',     # Men still guarding their own back row
+    'center',       # Pieces in the central quarter of the board
+    'edge',         # Pieces on the left or right edge
+]
+
+DEFAULT_WEIGHTS = {'man': 1, 'king': 2, 'advancement': 0, 'back_row': 0, 'center': 0, 'edge': 0}
+
+WEIGHTS_PATH = os.environ.get('CHECKERS_WEIGHTS') or \
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'weights.json')
+
+
+def load_weights(path) -> dict:
+    """
+    Reads a weights file written by tuner.py.
+
+    Args:
+        path (str): JSON file with a "weights" object mapping feature names to numbers.
+            Features missing from the file keep their default weight.
+
+    Returns:
+        dict: Weight for every name in FEATURES.
+
+    Raises:
+        ValueError: If the file names an unknown feature.
+    """
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    unknown = set(data["weights"]) - set(FEATURES)
+    if unknown:
+        raise ValueError(f"Unknown evaluation features in {path}: {sorted(unknown)}")
+    return {**DEFAULT_WEIGHTS, **data["weights"]}
+
+
+def save_weights(path, weights, **metadata):
+    """
+    Writes weights (plus any metadata, e.g. the fitted sigmoid scale) as JSON.
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"weights": weights, **metadata}, f, indent=2)
+        f.write('\n')
+
+
+def set_weights(weights):
+    """
+    Replaces the weights used by evaluate for the rest of the process.
+
+    Args:
+        weights (dict): Feature name to weight; missing features default to DEFAULT_WEIGHTS.
+    """
+    global WEIGHTS, _WEIGHT_VECTOR, _MATERIAL_ONLY
+    WEIGHTS = {**DEFAULT_WEIGHTS, **weights}
+    _WEIGHT_VECTOR = [WEIGHTS[name] for name in FEATURES]
+    _MATERIAL_ONLY = not any(_WEIGHT_VECTOR[2:])
+
+
+def weights_fingerprint() -> str:
+    """
+    Identifies the current weights, so stored scores can be matched to the weights that produced them.
+
+    Returns:
+        str: Short hex digest of the weights.
+    """
+    return hashlib.sha1(json.dumps(WEIGHTS, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def extract_features(board) -> list:
+    """
+    Computes the feature values of a position.
+
+    Args:
+        board (Board): The position.
+
+    Returns:
+        list: One value per name in FEATURES, white minus black.
+    """
+    size = len(board.board)
+    last_row = size - 1
+    low, high = size // 4, size - size // 4
+    features = [0, 0, 0.0, 0, 0, 0]
+
+    for pieces, sign in ((board.white_pieces, 1), (board.black_pieces, -1)):
+        for piece in pieces:
+            row, col = piece.position
+            if piece.is_king:
+                features[1] += sign
+            else:
+                features[0] += sign
+                own_row = 0 if sign == 1 else last_row
+                features[2] += sign * abs(row - own_row) / last_row
+                if row == own_row:
+                    features[3] += sign
+            if low <= row < high and low <= col < high:
+                features[4] += sign
+            if col == 0 or col == last_row:
+                features[5] += sign
+    return features
+
+
+def evaluate(board) -> float:
+    """
+    Scores a position from white's perspective with the loaded weights.
+
+    Returns:
+        float: Positive favors white. An int when only material weights are set.
+    """
+    if _MATERIAL_ONLY:
+        men = kings = 0
+        for pieces, sign in ((board.white_pieces, 1), (board.black_pieces, -1)):
+            for piece in pieces:
+                if piece.is_king:
+                    kings += sign
+                else:
+                    men += sign
+        return _WEIGHT_VECTOR[0] * men + _WEIGHT_VECTOR[1] * kings
+    return sum(w * f for w, f in zip(_WEIGHT_VECTOR, extract_features(board)))
+
+
+set_weights(load_weights(WEIGHTS_PATH) if os.path.exists(WEIGHTS_PATH) else DEFAULT_WEIGHTS)
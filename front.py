@@ -1,12 +1,86 @@
 from Board import Board
-from PIL import Image, ImageTk
-from minimax import get_ai_move
+from game_record import GameRecorder, append_pdn
+from search_cache import SearchCache
+import os
 import tkinter as tk
 import time
 
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images")
+SPRITE_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "checkers_ai", "sprites"
+)
+PIECE_IMAGES = ["white", "black", "white_king", "black_king"]
+# Seconds after which a temporary sprite file is considered abandoned
+SPRITE_TMP_MAX_AGE = 60
+
+# AI search depth per board size; larger boards have more moves per ply
+AI_DEPTHS = {4: 15, 8: 7}
+DEFAULT_AI_DEPTH = 5
+
 images = {}
 
 
+def cached_sprite(name, cell_size, cache_dir=SPRITE_CACHE_DIR):
+    """
+    Returns the path of a piece image resized for the given cell size, creating it if needed.
+
+    Resized sprites are cached on disk, keyed by cell size and the modification time of the
+    source image, so PIL is only imported when a sprite has to be (re)generated.
+
+    Args:
+        name (str): Image name, one of PIECE_IMAGES.
+        cell_size (int): The size (in pixels) of each board cell.
+        cache_dir (str): Directory holding the resized sprites.
+
+    Returns:
+        str: Path to a PNG file that Tk can load directly.
+    """
+    source = os.path.join(IMAGE_DIR, f"{name}.png")
+    mtime = os.stat(source).st_mtime_ns
+    path = os.path.join(cache_dir, f"{name}_{cell_size}_{mtime}.png")
+    if not os.path.exists(path):
+        from PIL import Image  # Only needed on a cache miss
+
+        os.makedirs(cache_dir, exist_ok=True)
+        remove_stale_sprites(name, cell_size, mtime, cache_dir)
+        img = Image.open(source).resize((cell_size - 10, cell_size - 10), Image.LANCZOS)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        img.save(tmp_path, format="PNG")
+        os.replace(tmp_path, path)  # Atomic, so concurrent launches never see partial files
+    return path
+
+
+def remove_stale_sprites(name, cell_size, mtime, cache_dir=SPRITE_CACHE_DIR):
+    """
+    Deletes cached sprites of older versions of a source image and abandoned temporary files.
+
+    The sprite for the current `mtime` is never touched, since a concurrent launch may be
+    about to load it. Temporary files are removed once they are older than
+    SPRITE_TMP_MAX_AGE seconds, long after any save still in progress would have finished.
+
+    Args:
+        name (str): Image name, one of PIECE_IMAGES.
+        cell_size (int): The size (in pixels) of each board cell.
+        mtime (int): Modification time (ns) of the current source image.
+        cache_dir (str): Directory holding the resized sprites.
+    """
+    prefix = f"{name}_{cell_size}_"
+    current = f"{prefix}{mtime}.png"
+    now = time.time()
+    for entry in os.listdir(cache_dir):
+        if not entry.startswith(prefix):
+            continue
+        entry_path = os.path.join(cache_dir, entry)
+        try:
+            if entry.endswith(".png") and entry != current:
+                os.remove(entry_path)  # Sprite of an older source image
+            elif entry.endswith(".tmp") and now - os.stat(entry_path).st_mtime > SPRITE_TMP_MAX_AGE:
+                os.remove(entry_path)  # Left behind by an interrupted save
+        except FileNotFoundError:
+            pass  # Removed by a concurrent launch
+
+
 def load_piece_images(cell_size):
     """
     Loads and resizes piece images for the game and stores them in a global dictionary.
@@ -15,18 +89,15 @@ def load_piece_images(cell_size):
         cell_size (int): The size (in pixels) of each board cell used to resize the images.
 
     Side Effects:
-        Populates the global `images` dictionary with ImageTk.PhotoImage objects for:
+        Populates the global `images` dictionary with tk.PhotoImage objects for:
         - "white"
         - "black"
         - "white_king"
         - "black_king"
     """
     global images
-    image_dir = "images"
-    for name in ["white", "black", "white_king", "black_king"]:
-        path = f"{image_dir}/{name}.png"
-        img = Image.open(path).resize((cell_size - 10, cell_size - 10), Image.LANCZOS)
-        images[name] = ImageTk.PhotoImage(img)
+    for name in PIECE_IMAGES:
+        images[name] = tk.PhotoImage(file=cached_sprite(name, cell_size))
 
 
 class GameGUI:
@@ -36,30 +107,41 @@ class GameGUI:
     - Mapping backend pieces to visual ones
     - Running the AI
     - Handling game resets and end popups
+
+    Rendering is incremental: the grid is drawn once, and piece canvas items are kept in
+    `square_map` and reused. A move only touches the squares changed by its move_piece
+    result, and a reset only moves, hides or re-images items whose square changed.
     """
 
-    def __init__(self, root, cell_size, board = '8x8'):
+    def __init__(self, root, cell_size, board = '8x8', record_path=None, cache_path=None):
         """
         Initializes the game interface.
 
         Args:
             root (tk.Tk): The root window for the application.
             cell_size (int): The pixel dimension of each board square.
+            board (str): Board size, e.g. '4x4', '8x8' or '10x10'.
+            record_path (str or None): PDN file that finished games are appended to.
+            cache_path (str or None): sqlite file used to persist AI search results between sessions.
         """
         # Initialize game logic
+        self.board_size = board
         self.board = Board(board=board)
-        if board == '4x4':
-            self.rows, self.cols = 4, 4
-        else:
-            self.rows, self.cols = 8, 8
+        self.record_path = record_path
+        self.recorder = GameRecorder(board=board)
+        self.search_cache = SearchCache(cache_path) if cache_path else None
+        if self.search_cache:
+            self.search_cache.preload()  # Load while the start screen is shown
+        self.rows = self.cols = self.board.size
 
         self.canvas = tk.Canvas(root, width=self.cols * cell_size, height=self.rows * cell_size)
         self.canvas.pack()
         self.cell_size = cell_size
 
-        self.draw_grid()  # Draw checkered board
+        self.draw_grid()  # Draw checkered board once; it never changes
 
-        self.piece_map = {}  # Maps backend pieces to GraphicalPiece objects
+        self.square_map = {}  # Maps (row, col) squares to the GraphicalPiece shown there
+        self.spare_pieces = {'white': [], 'black': []}  # Hidden items kept for reuse
 
         self.game_over = False
 
@@ -67,11 +149,7 @@ class GameGUI:
         self.popup(lambda: self.canvas.after(300, self.ai_move), start_menu=True, text=None)
 
         # Create graphical pieces
-        for row in self.board.board:
-            for piece in row:
-                if piece:
-                    gpiece = GraphicalPiece(self.canvas, piece, self)
-                    self.piece_map[piece] = gpiece
+        self.render_board()
 
     def ai_move(self):
         """
@@ -81,39 +159,18 @@ class GameGUI:
         if self.game_over:
             return
 
-        best_move = get_ai_move(self.board, depth=15 if self.rows == 4 else 7)
+        from minimax import get_ai_move  # Deferred so the window appears before the engine loads
+
+        best_move = get_ai_move(self.board, depth=AI_DEPTHS.get(self.rows, DEFAULT_AI_DEPTH), cache=self.search_cache)
         if not best_move:
             return
 
-        start_pos, end_pos = best_move
-        piece_to_change = self.board.board[start_pos[0]][start_pos[1]]  # Needed in case of promotion
-        result = self.board.move_piece(start_pos, end_pos)
+        result = self.board.move_piece(best_move[0], best_move[-1], path=best_move)
 
         if not result["moved"]:
             return
-
-        new_row, new_col = end_pos
-        moving_piece_backend = self.board.board[new_row][new_col]
-
-        # Handle promotion
-        if result["promoted"]:
-            self.replace_piece(piece_to_change, result["promoted"])
-            moving_piece = self.piece_map[moving_piece_backend]
-        else:
-            moving_piece = self.piece_map.get(moving_piece_backend)
-
-        # Move the piece visually on the canvas
-        if moving_piece:
-            self.canvas.coords(
-                moving_piece.piece_id,
-                new_col * self.cell_size + self.cell_size // 2,
-                new_row * self.cell_size + self.cell_size // 2
-            )
-            moving_piece.piece.position = (new_row, new_col)
-
-        # Remove captured piece
-        if result["captured"]:
-            self.remove_piece(result["captured"])
+        self.record_move(result)
+        self.apply_move(result)
 
         # End-of-game popup
         if result['game_over_text']:
@@ -121,55 +178,93 @@ class GameGUI:
             self.popup(self.reset_game, start_menu=False, text=result['game_over_text'])
             return
 
-    def gui_lookup(self, backend_piece):
+    def record_move(self, result):
         """
-        Looks up the graphical representation of a backend piece.
+        Adds a move to the game record and saves the game once it is finished.
 
         Args:
-            backend_piece (Piece): The logic (backend) piece object.
+            result (dict): The dictionary returned by Board.move_piece.
+        """
+        self.recorder.record_move(result)
+        if self.recorder.finished() and self.record_path:
+            append_pdn(self.record_path, self.recorder.record)
+
+    def apply_move(self, result):
+        """
+        Updates the canvas for a successful move, touching only the squares it changed.
+        A capture chain moves the piece straight to its final square.
 
-        Returns:
-            GraphicalPiece or None: The GUI object mapped to the backend piece, if it exists.
+        Args:
+            result (dict): The dictionary returned by Board.move_piece.
+
+        Side Effects:
+            - Moves the piece item from the start to the end square.
+            - Hides captured pieces and swaps the image of a promoted piece.
         """
-        return self.piece_map.get(backend_piece)
+        for captured in result["captured"]:
+            self.remove_piece(captured)
+
+        end_row, end_col = result["end"]
+        gpiece = self.square_map.pop(result["start"])
+        self.square_map[result["end"]] = gpiece
+        gpiece.set_piece(self.board.board[end_row][end_col])
+
+    def place_piece(self, backend_piece):
+        """
+        Shows a backend piece, reusing a hidden canvas item of the same color if one exists.
+
+        Args:
+            backend_piece (Piece): The piece to display.
+        """
+        spares = self.spare_pieces[backend_piece.color]
+        if spares:
+            gpiece = spares.pop()
+            gpiece.set_piece(backend_piece)
+        else:
+            gpiece = GraphicalPiece(self.canvas, backend_piece, self)
+        self.square_map[backend_piece.position] = gpiece
 
     def remove_piece(self, backend_piece):
         """
-        Removes a graphical piece from the canvas and internal map.
+        Removes a graphical piece from the board and keeps its canvas item for reuse.
 
         Args:
             backend_piece (Piece): The piece object to remove.
 
         Side Effects:
-            - Deletes the image from the canvas.
-            - Removes the mapping from piece_map.
+            - Hides the image on the canvas.
+            - Removes the mapping from square_map.
         """
-        gpiece = self.gui_lookup(backend_piece)
+        gpiece = self.square_map.pop(backend_piece.position, None)
         if gpiece:
             gpiece.remove_from_board()
-            del self.piece_map[backend_piece]
+            self.spare_pieces[gpiece.piece.color].append(gpiece)
 
-    def replace_piece(self, old_piece, new_piece):
+    def render_board(self):
         """
-        Replaces a backend piece on the board (typically due to promotion) and updates GUI.
-
-        Args:
-            old_piece (Piece): The original piece to remove.
-            new_piece (Piece): The new piece (e.g., King) to display in its place.
+        Brings the canvas in line with the backend board, changing only squares that differ.
 
         Side Effects:
-            - Removes the old graphical piece.
-            - Creates a new one for the promoted piece.
-            - Updates the piece_map accordingly.
+            - Re-targets, hides or creates GraphicalPiece items as needed.
         """
-        self.remove_piece(old_piece)
-        gpiece = GraphicalPiece(self.canvas, new_piece, self)
-        self.piece_map[new_piece] = gpiece
-        self.piece_map[new_piece].gui = self
+        for square, gpiece in list(self.square_map.items()):
+            piece = self.board.board[square[0]][square[1]]
+            if piece is None or piece.color != gpiece.piece.color:
+                del self.square_map[square]
+                gpiece.remove_from_board()
+                self.spare_pieces[gpiece.piece.color].append(gpiece)
+            else:
+                gpiece.set_piece(piece)
+
+        for row in self.board.board:
+            for piece in row:
+                if piece and piece.position not in self.square_map:
+                    self.place_piece(piece)
 
     def draw_grid(self):
         """
         Draws the checkered board onto the canvas using alternating gray and white squares.
+        The squares are tagged "grid" and kept for the lifetime of the canvas.
         """
         for row in range(self.rows):
             for col in range(self.cols):
@@ -178,7 +273,7 @@ class GameGUI:
                 x2 = x1 + self.cell_size
                 y2 = y1 + self.cell_size
                 color = "gray" if (row + col) % 2 == 0 else "white"
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="black")
+                self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="black", tags="grid")
 
     def popup(self, func, start_menu, text):
         """
@@ -246,23 +341,17 @@ class GameGUI:
     def reset_game(self):
         """
         Resets the entire game state:
-        - Clears the canvas.
-        - Reinitializes the board and GUI pieces.
-        - Triggers an AI move after 2 seconds.
+        - Reinitializes the board.
+        - Re-renders only the squares that differ from the starting position.
+        - Triggers an AI move after 300 milliseconds.
 
         Side Effects:
-            - Modifies canvas, board, and piece_map.
+            - Modifies canvas, board, and square_map.
         """
-        self.canvas.delete("all")
-        self.board = Board()
-        self.piece_map.clear()
-        self.draw_grid()
-
-        for row in self.board.board:
-            for piece in row:
-                if piece:
-                    gpiece = GraphicalPiece(self.canvas, piece, self)
-                    self.piece_map[piece] = gpiece
+        self.board = Board(board=self.board_size)
+        self.recorder = GameRecorder(board=self.board_size)
+        self.game_over = False
+        self.render_board()
 
         self.canvas.after(300, self.ai_move)
 
@@ -275,8 +364,11 @@ class GraphicalPiece:
         canvas (tk.Canvas): The canvas where the piece is drawn.
         piece (Piece): The backend logic piece.
         gui (GameGUI): Reference to the main GUI for interaction.
-        image (ImageTk.PhotoImage): The image used to represent the piece.
+        image (tk.PhotoImage): The image used to represent the piece.
         piece_id (int): The canvas ID of the image object.
+        center (tuple or None): Canvas coordinates the item was last placed at; None while
+            dragging, when the item is away from its square.
+        hidden (bool): Whether the item is hidden and waiting to be reused.
     """
 
     def __init__(self, canvas, piece, gui):
@@ -293,11 +385,12 @@ class GraphicalPiece:
         self.piece = piece
         self.gui = gui
         self.image = images[f"{piece.color}" + ("_king" if self.piece.is_king else '')]
+        self.center = self.square_center(piece.position)
+        self.hidden = False
 
         # Draw the piece centered in the cell
         self.piece_id = self.canvas.create_image(
-            piece.position[1] * self.gui.cell_size + self.gui.cell_size // 2,
-            piece.position[0] * self.gui.cell_size + self.gui.cell_size // 2,
+            *self.center,
             image=self.image,
             anchor="center"
         )
@@ -308,11 +401,41 @@ class GraphicalPiece:
             self.canvas.tag_bind(self.piece_id, "<B1-Motion>", lambda event: self.on_drag(event, multiply=gui.rows))
             self.canvas.tag_bind(self.piece_id, "<ButtonRelease-1>", lambda event: self.on_drag_end(event, max_row=gui.rows - 1, max_col=gui.cols - 1))
 
+    def square_center(self, position):
+        """
+        Returns the canvas coordinates of the center of a (row, col) square.
+        """
+        return (position[1] * self.gui.cell_size + self.gui.cell_size // 2,
+                position[0] * self.gui.cell_size + self.gui.cell_size // 2)
+
+    def set_piece(self, piece):
+        """
+        Points this item at a backend piece, issuing only the canvas updates that are needed.
+
+        Args:
+            piece (Piece): The backend piece to display. Must have the same color.
+        """
+        self.piece = piece
+        image = images[f"{piece.color}" + ("_king" if piece.is_king else '')]
+        if image is not self.image:
+            self.image = image
+            self.canvas.itemconfigure(self.piece_id, image=image)
+
+        center = self.square_center(piece.position)
+        if center != self.center:
+            self.center = center
+            self.canvas.coords(self.piece_id, *center)
+
+        if self.hidden:
+            self.hidden = False
+            self.canvas.itemconfigure(self.piece_id, state="normal")
+
     def remove_from_board(self):
         """
-        Deletes the piece's image from the canvas.
+        Hides the piece's image so the canvas item can be reused.
         """
-        self.canvas.delete(self.piece_id)
+        self.hidden = True
+        self.canvas.itemconfigure(self.piece_id, state="hidden")
 
     def on_drag_start(self, event):
         """
@@ -336,6 +459,7 @@ class GraphicalPiece:
         dx = x - self.start_x
         dy = y - self.start_y
         self.canvas.move(self.piece_id, dx, dy)
+        self.center = None
         self.start_x = x
         self.start_y = y
 
@@ -343,11 +467,8 @@ class GraphicalPiece:
         """
         Moves the piece image back to its original grid position (used on illegal move).
         """
-        self.canvas.coords(
-            self.piece_id,
-            self.piece.position[1] * self.gui.cell_size + self.gui.cell_size // 2,
-            self.piece.position[0] * self.gui.cell_size + self.gui.cell_size // 2
-        )
+        self.center = self.square_center(self.piece.position)
+        self.canvas.coords(self.piece_id, *self.center)
 
     def on_drag_end(self, event, max_col = 7, max_row = 7):
         """
@@ -359,30 +480,18 @@ class GraphicalPiece:
         new_col = min(max(0, event.x // self.gui.cell_size), max_col)
         new_row = min(max(0, event.y // self.gui.cell_size), max_row)
 
-        result = self.piece.board.move_piece(self.piece.position, (new_row, new_col))
+        result = self.gui.board.move_piece(self.piece.position, (new_row, new_col))
 
         if not result["moved"]:
             self.snap_back()
             return
-        else:
-            # Move piece to new position visually
-            self.canvas.coords(
-                self.piece_id,
-                new_col * self.gui.cell_size + self.gui.cell_size // 2,
-                new_row * self.gui.cell_size + self.gui.cell_size // 2
-            )
-            self.piece.position = (new_row, new_col)
-
-        # Remove captured piece visually
-        if result["captured"]:
-            self.gui.remove_piece(result["captured"])
-
-        # Replace with king piece if promoted
-        if result["promoted"]:
-            self.gui.replace_piece(self.piece, result["promoted"])
+
+        # Move, capture and promote visually
+        self.gui.record_move(result)
+        self.gui.apply_move(result)
 
         # Trigger AI move if player's move is complete
-        if self.piece.board.last_move_color == 'black':
+        if self.gui.board.last_move_color == 'black':
             self.canvas.after(150, self.gui.ai_move)
 
         # Handle game over
@@ -0,0 +1,406 @@
+from Board import Board
+import os
+import re
+import struct
+
+# PDN result tokens, scored from white's point of view
+RESULT_WHITE = '1-0'
+RESULT_BLACK = '0-1'
+RESULT_DRAW = '1/2-1/2'
+RESULT_UNFINISHED = '*'
+RESULTS = (RESULT_WHITE, RESULT_BLACK, RESULT_DRAW, RESULT_UNFINISHED)
+
+# Binary log layout: every game is a self-contained record so the log can be appended to
+# and streamed without an index.
+#   header: magic (4s), board size (B), start rows (B, 0 for the default layout),
+#           result code (B), move count (H)
+#   move:   square count (B) followed by that many squares encoded as row * size + col (B each)
+# One byte per square limits the format to boards of at most 16x16; use PDN for larger ones.
+# Records written before start rows were recorded use BINARY_MAGIC_V1 and a header without
+# that byte; they are still read, as games with the default layout.
+BINARY_MAGIC = b'CKG2'
+BINARY_MAGIC_V1 = b'CKG1'
+BINARY_MAX_SIZE = 16
+_HEADER = struct.Struct('<4sBBBH')
+_HEADER_V1 = struct.Struct('<4sBBH')
+_RESULT_CODES = {RESULT_UNFINISHED: 0, RESULT_WHITE: 1, RESULT_BLACK: 2, RESULT_DRAW: 3}
+_RESULT_NAMES = {code: name for name, code in _RESULT_CODES.items()}
+
+# Tag values escape '"' and '\\' with a backslash
+_TAG_RE = re.compile(r'^\[(\w+)\s+"((?:[^"\\]|\\.)*)"\]\s*$')
+_ESCAPED_RE = re.compile(r'\\(.)')
+_MOVE_NUMBER_RE = re.compile(r'^\d+\.+$')
+
+
+class GameRecord:
+    """
+    A single recorded game.
+
+    Attributes:
+        board (str): Board size the game was played on, e.g. '8x8'.
+        start_rows (int or None): Rows of men per side at the start, or None for the
+            default layout of the board size (see Board).
+        moves (list): Moves in playing order, each a tuple of (row, col) squares from start to end.
+        result (str): PDN result token ('1-0', '0-1', '1/2-1/2' or '*').
+        tags (dict): Additional PDN tags such as Event or Date.
+    """
+
+    def __init__(self, board='8x8', moves=None, result=RESULT_UNFINISHED, tags=None, start_rows=None):
+        self.board = board
+        self.start_rows = start_rows
+        self.moves = list(moves) if moves else []
+        self.result = result
+        self.tags = dict(tags) if tags else {}
+
+    @property
+    def size(self) -> int:
+        """Number of rows (and columns) of the board."""
+        return int(self.board.split('x')[0])
+
+    def __len__(self):
+        return len(self.moves)
+
+    def __eq__(self, other):
+        if not isinstance(other, GameRecord):
+            return NotImplemented
+        return (self.board, self.start_rows, self.moves, self.result, self.tags) == \
+            (other.board, other.start_rows, other.moves, other.result, other.tags)
+
+    def __repr__(self):
+        return f"GameRecord(board={self.board!r}, moves={len(self.moves)}, result={self.result!r})"
+
+
+class GameRecorder:
+    """
+    Builds a GameRecord from the result dictionaries returned by Board.move_piece.
+
+    Attributes:
+        record (GameRecord): The game being recorded.
+    """
+
+    def __init__(self, board='8x8', start_rows=None, **tags):
+        self.record = GameRecord(board=board, tags=tags, start_rows=start_rows)
+
+    def record_move(self, result):
+        """
+        Appends a move to the record.
+
+        Args:
+            result (dict): The dictionary returned by Board.move_piece. Moves that were
+                rejected ('moved' is False) are ignored.
+        """
+        if not result["moved"]:
+            return
+        self.record.moves.append(tuple(tuple(square) for square in result["path"]))
+        if result["game_over_text"]:
+            self.record.result = result_from_text(result["game_over_text"])
+
+    def finished(self) -> bool:
+        """Returns True once a game over result has been recorded."""
+        return self.record.result != RESULT_UNFINISHED
+
+
+def result_from_text(game_over_text) -> str:
+    """
+    Converts a Board.move_piece game over message into a PDN result token.
+
+    Args:
+        game_over_text (str or None): E.g. "white won!" or "Draw!".
+
+    Returns:
+        str: The matching PDN result token.
+    """
+    if not game_over_text:
+        return RESULT_UNFINISHED
+    text = game_over_text.lower()
+    if text.startswith('white'):
+        return RESULT_WHITE
+    if text.startswith('black'):
+        return RESULT_BLACK
+    return RESULT_DRAW
+
+
+def square_name(square, size) -> str:
+    """
+    Returns the algebraic name of a square ('a1' is the bottom-left corner, black's side).
+
+    Args:
+        square (tuple): (row, col) position.
+        size (int): Board size.
+    """
+    row, col = square
+    return f"{chr(ord('a') + col)}{size - row}"
+
+
+def parse_square(name, size) -> tuple:
+    """
+    Parses an algebraic square name produced by square_name.
+
+    Args:
+        name (str): E.g. 'c3'.
+        size (int): Board size.
+
+    Returns:
+        tuple: (row, col) position.
+    """
+    col = ord(name[0]) - ord('a')
+    row = size - int(name[1:])
+    if not (0 <= row < size and 0 <= col < size):
+        raise ValueError(f"Square {name!r} is outside a {size}x{size} board")
+    return row, col
+
+
+def format_move(move, size) -> str:
+    """
+    Formats a move in PDN notation: 'c3-d4' for a step, 'c3xe5' (or 'c3xe5xc7') for captures.
+    """
+    separator = 'x' if abs(move[1][0] - move[0][0]) == 2 else '-'
+    return separator.join(square_name(square, size) for square in move)
+
+
+def parse_move(text, size) -> tuple:
+    """
+    Parses a PDN move produced by format_move.
+
+    Returns:
+        tuple: The (row, col) squares visited by the move.
+    """
+    return tuple(parse_square(name, size) for name in re.split('[-x]', text))
+
+
+def _escape_tag(value) -> str:
+    """
+    Escapes a PDN tag value so that it can be written between double quotes.
+    """
+    return str(value).replace('\\', '\\\\').replace('"', '\\"')
+
+
+def format_pdn(record) -> str:
+    """
+    Serializes a game record as PDN text.
+
+    Args:
+        record (GameRecord): The game to serialize.
+
+    Returns:
+        str: Tag section, movetext and result, terminated by a blank line.
+    """
+    tags = {"Board": record.board}
+    if record.start_rows is not None:
+        tags["StartRows"] = record.start_rows
+    tags.update(record.tags)
+    tags["Result"] = record.result
+    lines = [f'[{key} "{_escape_tag(value)}"]' for key, value in tags.items()]
+    lines.append('')
+
+    tokens = []
+    for ply, move in enumerate(record.moves):
+        text = format_move(move, record.size)
+        tokens.append(f"{ply // 2 + 1}. {text}" if ply % 2 == 0 else text)
+    tokens.append(record.result)
+
+    line = ''
+    for token in tokens:
+        if line and len(line) + len(token) + 1 > 79:
+            lines.append(line)
+            line = token
+        else:
+            line = f"{line} {token}" if line else token
+    lines.append(line)
+    return '\n'.join(lines) + '\n\n'
+
+
+def append_pdn(path, record):
+    """
+    Appends a game to a PDN file, creating the file if needed.
+    """
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(format_pdn(record))
+
+
+def iter_pdn(path):
+    """
+    Lazily reads games from a PDN file.
+
+    Only one game is held in memory at a time, so arbitrarily large files can be processed.
+
+    Args:
+        path (str): Path to the PDN file.
+
+    Yields:
+        GameRecord: Each game in file order.
+    """
+    with open(path, encoding='utf-8') as f:
+        yield from parse_pdn_lines(f)
+
+
+def parse_pdn_lines(lines):
+    """
+    Parses PDN games from an iterable of lines.
+
+    Yields:
+        GameRecord: Each complete game. A game ends at its result token.
+    """
+    tags = {}
+    moves = []
+    in_comment = False
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('%'):
+            continue
+        match = _TAG_RE.match(line)
+        if match and not in_comment:
+            tags[match.group(1)] = _ESCAPED_RE.sub(r'\1', match.group(2))
+            continue
+
+        board = tags.get("Board", '8x8')
+        size = int(board.split('x')[0])
+        for token in line.split():
+            if in_comment:
+                in_comment = not token.endswith('}')
+                continue
+            if token.startswith('{'):
+                in_comment = not token.endswith('}')
+                continue
+            if _MOVE_NUMBER_RE.match(token):
+                continue
+            if token in RESULTS:
+                extra = {key: value for key, value in tags.items() if key not in ("Board", "StartRows", "Result")}
+                start_rows = int(tags["StartRows"]) if "StartRows" in tags else None
+                yield GameRecord(board=board, moves=moves, result=token, tags=extra, start_rows=start_rows)
+                tags = {}
+                moves = []
+                continue
+            moves.append(parse_move(token, size))
+
+
+def encode_binary(record) -> bytes:
+    """
+    Encodes a game record in the append-only binary log format.
+
+    Raises:
+        ValueError: If the board is larger than BINARY_MAX_SIZE.
+    """
+    size = record.size
+    if size > BINARY_MAX_SIZE:
+        raise ValueError(f"Binary game logs support boards up to {BINARY_MAX_SIZE}x{BINARY_MAX_SIZE}, "
+                         f"got {size}x{size}; use PDN instead")
+    parts = [_HEADER.pack(BINARY_MAGIC, size, record.start_rows or 0, _RESULT_CODES[record.result],
+                          len(record.moves))]
+    for move in record.moves:
+        parts.append(bytes([len(move)] + [row * size + col for row, col in move]))
+    return b''.join(parts)
+
+
+def append_binary_log(path, record):
+    """
+    Appends a game to a binary log file with a single write call.
+    """
+    data = encode_binary(record)
+    with open(path, 'ab') as f:
+        f.write(data)
+
+
+def iter_binary_log(path):
+    """
+    Lazily reads games from a binary log written by append_binary_log.
+
+    Args:
+        path (str): Path to the log file.
+
+    Yields:
+        GameRecord: Each game in file order.
+
+    Raises:
+        ValueError: If the file is corrupt. A truncated trailing record (e.g. from an
+            interrupted write) is ignored.
+    """
+    with open(path, 'rb') as f:
+        while True:
+            offset = f.tell()
+            magic = f.read(len(BINARY_MAGIC))
+            if len(magic) < len(BINARY_MAGIC):
+                return
+            if magic == BINARY_MAGIC:
+                header = _HEADER
+            elif magic == BINARY_MAGIC_V1:
+                header = _HEADER_V1
+            else:
+                raise ValueError(f"Corrupt game record at offset {offset}")
+            fields = f.read(header.size - len(magic))
+            if len(fields) < header.size - len(magic):
+                return
+            if header is _HEADER:
+                _, size, start_rows, result_code, move_count = header.unpack(magic + fields)
+            else:
+                _, size, result_code, move_count = header.unpack(magic + fields)
+                start_rows = 0
+            if (result_code not in _RESULT_NAMES or not 4 <= size <= BINARY_MAX_SIZE or size % 2
+                    or start_rows >= size // 2):
+                raise ValueError(f"Corrupt game record at offset {offset}")
+
+            moves = []
+            for _ in range(move_count):
+                count = f.read(1)
+                squares = f.read(count[0]) if count else b''
+                if not count or len(squares) < count[0]:
+                    return
+                if count[0] < 2 or max(squares) >= size * size:
+                    raise ValueError(f"Corrupt game record at offset {offset}")
+                moves.append(tuple(divmod(square, size) for square in squares))
+            yield GameRecord(board=f"{size}x{size}", moves=moves, result=_RESULT_NAMES[result_code],
+                             start_rows=start_rows or None)
+
+
+def iter_games(path):
+    """
+    Lazily reads games from either a PDN file or a binary log, chosen by file extension.
+    """
+    if os.path.splitext(path)[1].lower() == '.pdn':
+        return iter_pdn(path)
+    return iter_binary_log(path)
+
+
+def iter_positions(record):
+    """
+    Replays a game without any GUI, yielding the board after every ply.
+
+    The same Board instance is updated in place and yielded each time; copy it if it
+    must outlive the iteration step.
+
+    Args:
+        record (GameRecord): The game to replay.
+
+    Yields:
+        tuple: (ply, board) where ply is the number of moves applied so far.
+
+    Raises:
+        ValueError: If the record contains an illegal move.
+    """
+    board = Board(board=record.board, start_rows=record.start_rows)
+    yield 0, board
+    for ply, move in enumerate(record.moves, start=1):
+        result = board.move_piece(move[0], move[-1], path=move)
+        if not result["moved"]:
+            raise ValueError(f"Illegal move {format_move(move, record.size)} at ply {ply}")
+        yield ply, board
+
+
+def replay(record, ply=None):
+    """
+    Reconstructs the position after a given number of plies.
+
+    Args:
+        record (GameRecord): The game to replay.
+        ply (int or None): Number of moves to apply. Defaults to the whole game.
+
+    Returns:
+        Board: The reconstructed board.
+    """
+    if ply is None:
+        ply = len(record.moves)
+    if not 0 <= ply <= len(record.moves):
+        raise ValueError(f"Ply {ply} is outside the game (0-{len(record.moves)})")
+    for current, board in iter_positions(record):
+        if current == ply:
+            return board
@@ -0,0 +1,83 @@
+from functools import lru_cache
+
+# Starting layouts that differ from the generic rule in board_layout
+_LAYOUTS = {
+    4: (1, 0),  # One row of two men each, on the light-parity squares
+}
+
+DIRECTIONS = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+
+
+def parse_board_size(board) -> int:
+    """
+    Parses a board size given as 'NxN' (e.g. '10x10') or as an int.
+
+    Raises:
+        ValueError: If the size is not an even number of at least 4, or the board is not square.
+    """
+    if isinstance(board, int):
+        size = board
+    else:
+        rows, _, cols = str(board).partition('x')
+        if not rows.isdigit() or (cols and cols != rows):
+            raise ValueError(f"Unsupported board {board!r}; expected a square size like '8x8'")
+        size = int(rows)
+    if size < 4 or size % 2:
+        raise ValueError(f"Board size must be an even number of at least 4, got {size}")
+    return size
+
+
+def board_layout(size) -> tuple:
+    """
+    Returns the starting layout for a board size.
+
+    By default each side fills all but the two middle rows on the squares where
+    (row + col) is odd, giving 3 rows on 8x8, 4 on 10x10 and 5 on 12x12.
+
+    Returns:
+        tuple: (number of starting rows per side, parity of the playable squares)
+    """
+    return _LAYOUTS.get(size, ((size - 2) // 2, 1))
+
+
+@lru_cache(maxsize=None)
+def diagonal_table(size) -> tuple:
+    """
+    Precomputes the diagonal neighbours of every square, so move generation needs no bounds checks.
+
+    Returns:
+        tuple: table[row][col] is a dict mapping each direction in DIRECTIONS to
+        (step, jump): the adjacent square and the square two steps away, each a
+        (row, col) tuple or None when it is off the board.
+    """
+    def on_board(row, col):
+        return (row, col) if 0 <= row < size and 0 <= col < size else None
+
+    return tuple(
+        tuple(
+            {(dr, dc): (on_board(row + dr, col + dc), on_board(row + 2 * dr, col + 2 * dc))
+             for dr, dc in DIRECTIONS}
+            for col in range(size)
+        )
+        for row in range(size)
+    )
+
+
+def rotate_square(square, size) -> tuple:
+    """
+    Maps a square through a half turn of the board.
+
+    A position rotated by 180 degrees with the colors swapped is equivalent to the
+    original with the other side to move: rotated squares keep their color, and every
+    piece now moves in the direction the other side's pieces do. (A left-right mirror
+    is not a symmetry here: on an even board it puts pieces on the unplayable squares.)
+    """
+    return (size - 1 - square[0], size - 1 - square[1])
+
+
+def rotate_move(move, size) -> tuple:
+    """
+    Maps a move, given as the squares it visits, through a half turn of the board.
+    """
+    last = size - 1
+    return tuple((last - row, last - col) for row, col in move)
@@ -1,17 +1,21 @@
 from front import load_piece_images, GameGUI
+from geometry import parse_board_size
 import tkinter as tk
 
-# You can change the board size using BOARD_SIZE = '4x4' or BOARD_SIZE = '8x8'
+# You can change the board size using BOARD_SIZE = '4x4', '8x8', '10x10' or any even 'NxN'
 BOARD_SIZE = '8x8'
 
+# Finished games are appended to this PDN file
+GAME_RECORD_PATH = 'games.pdn'
+
+# AI search results are kept in this sqlite file between sessions
+SEARCH_CACHE_PATH = 'search_cache.sqlite'
+
 
 def calculate_cell_size(screen_width, screen_height):
     usable_width = int(screen_width * 0.9)
     usable_height = int(screen_height * 0.9)
-    if BOARD_SIZE == '8x8':
-        rows, cols = 8, 8
-    else:
-        rows, cols = 4, 4
+    rows = cols = parse_board_size(BOARD_SIZE)
     return min(usable_width // cols, usable_height // rows)
 
 if __name__ == "__main__":
@@ -23,5 +27,6 @@ if __name__ == "__main__":
 
     load_piece_images(cell_size)
 
-    gui = GameGUI(root, cell_size, board=BOARD_SIZE)
+    gui = GameGUI(root, cell_size, board=BOARD_SIZE, record_path=GAME_RECORD_PATH,
+                  cache_path=SEARCH_CACHE_PATH)
     root.mainloop()
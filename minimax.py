@@ -1,19 +1,254 @@
-def get_ai_move(board, depth=8):
+from Board import Board
+from cache import LRUCache, MemoryGovernor, resident_memory
+from geometry import rotate_move
+import time
+
+# Transposition table bound types
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Score of a game won at the root. A win found n plies deep scores WIN - n, so shorter
+# wins (and longer losses) are preferred.
+WIN = 10_000
+# Scores beyond this are proven wins or losses, never evaluations
+_WIN_THRESHOLD = WIN - 1_000
+
+# A bound on white's score becomes the opposite bound when the position is rotated
+_ROTATED_BOUND = {EXACT: EXACT, LOWER: UPPER, UPPER: LOWER}
+
+
+class SearchTimeout(Exception):
+    """Raised inside minimax when the search deadline or node budget is exhausted."""
+
+
+class SearchOptions:
+    """
+    Selective-search switches for minimax. All features are off by default, which gives
+    a plain full-width alpha-beta search.
+
+    Attributes:
+        lmr (bool): Late move reductions: quiet moves ordered after the first
+            `lmr_full_moves` are searched one ply shallower.
+        lmr_min_depth (int): Minimum remaining depth at which moves are reduced.
+        lmr_full_moves (int): Number of moves always searched at full depth.
+        futility (bool): Futility pruning: at the last ply, skip quiet moves that cannot
+            bring the static evaluation back above alpha (or below beta) by `futility_margin`.
+        futility_margin (float): Largest evaluation swing expected from one quiet move.
+        research (bool): Re-search a reduced move at full depth when it unexpectedly
+            beats the current bound (fails high).
+        deadline (float or None): time.monotonic() value after which minimax raises SearchTimeout.
+        max_nodes (int or None): Node count after which minimax raises SearchTimeout.
+        governor (MemoryGovernor or None): Keeps the caches within their memory budget;
+            enforced after every node.
+        nodes (int): Nodes searched so far with these options.
+    """
+
+    def __init__(self, lmr=False, futility=False, research=True,
+                 lmr_min_depth=3, lmr_full_moves=3, futility_margin=1, deadline=None,
+                 max_nodes=None, governor=None):
+        self.deadline = deadline
+        self.max_nodes = max_nodes
+        self.governor = governor
+        self.nodes = 0
+        self.lmr = lmr
+        self.futility = futility
+        self.research = research
+        self.lmr_min_depth = lmr_min_depth
+        self.lmr_full_moves = lmr_full_moves
+        self.futility_margin = futility_margin
+
+    def count_node(self):
+        """
+        Counts a searched node and enforces the budgets.
+
+        Raises:
+            SearchTimeout: If the deadline has passed or the node budget is spent.
+        """
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise SearchTimeout()
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise SearchTimeout()
+        if self.governor is not None:
+            self.governor.enforce()
+
+
+class EngineConfig:
+    """
+    Resource limits for get_ai_move, for hosts that run many engines side by side.
+
+    The transposition table is kept between calls. Together with the process-wide move
+    cache (Board.move_cache, looked up on every check, so replacing it is fine) it shares
+    one memory budget: when their estimated total exceeds it, each evicts its least
+    recently used entries in proportion to its size. A SearchCache passed to get_ai_move
+    replaces the transposition table and is bounded by its own max_entries instead.
+
+    Attributes:
+        max_cache_bytes (int or None): Memory budget for the caches; None leaves them to
+            their own entry limits.
+        max_nodes (int or None): Nodes one call may search.
+        time_limit (float or None): Seconds one call may take.
+        tt (LRUCache): Transposition table shared by the calls using this configuration.
+        governor (MemoryGovernor or None): Enforces max_cache_bytes.
+        last_report (dict or None): Usage of the most recent call: nodes, depth completed,
+            seconds, resident memory in bytes (None where unavailable) and estimated bytes
+            per cache after the final budget check.
     """
-    Determines the best move for the AI using the minimax algorithm.
+
+    def __init__(self, max_cache_bytes=None, max_nodes=None, time_limit=None, tt_entries=1_000_000):
+        self.max_cache_bytes = max_cache_bytes
+        self.max_nodes = max_nodes
+        self.time_limit = time_limit
+        self.tt = LRUCache(maxsize=tt_entries)
+        self.governor = None
+        if max_cache_bytes is not None:
+            self.governor = MemoryGovernor(max_cache_bytes, {
+                "tt": self.tt,
+                "moves": lambda: Board.move_cache,
+            })
+        self.last_report = None
+
+
+def get_ai_move(board, depth=8, cache=None, lmr=False, futility=False, research=True, time_limit=None,
+                config=None):
+    """
+    Determines the best move for the side to move using the minimax algorithm.
+
+    With a time limit the search deepens iteratively from depth 1 and returns the best move
+    of the deepest iteration that finished in time, or stops early once an iteration
+    proves a win or a loss.
 
     Parameters:
         board (Board): The current game board.
         depth (int): The maximum depth for the minimax search.
+        cache (SearchCache or None): Persistent cache used as the transposition table.
+            Results found in earlier sessions are reused, and new results are written
+            back in the background after the search.
+        lmr (bool): Enable late move reductions (see SearchOptions).
+        futility (bool): Enable futility pruning near the leaves.
+        research (bool): Re-search reduced moves that fail high at full depth.
+        time_limit (float or None): Seconds the search may take; `depth` then caps the iterations.
+        config (EngineConfig or None): Memory, node and time budgets. The search deepens
+            iteratively when the config sets a budget, and its usage is stored in
+            config.last_report.
 
     Returns:
-        tuple: The best move as ((start_row, start_col), (end_row, end_col)), or None if no move is possible.
+        tuple: The best move as the squares it visits, ((start_row, start_col), ..., (end_row, end_col)),
+            or None if no move is possible.
     """
-    _, best_move = minimax(board, depth, float('-inf'), float('inf'), maximizing_player=True)
+    start = time.monotonic()
+    options = SearchOptions(lmr=lmr, futility=futility, research=research)
+    maximizing_player = board.last_move_color == 'black'  # White maximizes
+    tt = cache
+    if config is not None:
+        if config.time_limit is not None:
+            time_limit = config.time_limit if time_limit is None else min(time_limit, config.time_limit)
+        options.max_nodes = config.max_nodes
+        options.governor = config.governor
+        if tt is None:
+            tt = config.tt
+
+    completed_depth = 0
+    if time_limit is None and options.max_nodes is None:
+        _, best_move = minimax(board, depth, float('-inf'), float('inf'), maximizing_player,
+                               tt=tt, options=options)
+        completed_depth = depth
+    else:
+        if time_limit is not None:
+            options.deadline = start + time_limit
+        if tt is None:
+            tt = {}  # Earlier iterations order the moves of later ones
+        color = 'white' if maximizing_player else 'black'
+        moves = board.get_all_moves(color)
+        best_move = moves[0] if moves else None
+        for iteration_depth in range(1, depth + 1):
+            try:
+                score, best_move = minimax(board, iteration_depth, float('-inf'), float('inf'), maximizing_player,
+                                           tt=tt, options=options)
+            except SearchTimeout:
+                break
+            completed_depth = iteration_depth
+            if is_proven(score):
+                break  # Deeper iterations cannot change a forced result
+
+    if cache is not None:
+        cache.flush_async()
+    if config is not None:
+        if config.governor is not None:
+            config.governor.enforce()  # The root's own entries were stored after its last node
+        config.last_report = {
+            "nodes": options.nodes,
+            "depth": completed_depth,
+            "seconds": time.monotonic() - start,
+            "rss": resident_memory(),
+            "cache_bytes": config.governor.usage() if config.governor else None,
+        }
     return best_move
 
 
-def minimax(board, depth, alpha, beta, maximizing_player):
+def is_proven(score) -> bool:
+    """
+    Checks whether a score is a forced win or loss rather than an evaluation.
+    """
+    return abs(score) >= _WIN_THRESHOLD
+
+
+def _score_to_tt(score, ply):
+    # Proven scores are stored as distance from the stored position, not from the root
+    if score >= _WIN_THRESHOLD:
+        return score + ply
+    if score <= -_WIN_THRESHOLD:
+        return score - ply
+    return score
+
+
+def _score_from_tt(score, ply):
+    if score >= _WIN_THRESHOLD:
+        return score - ply
+    if score <= -_WIN_THRESHOLD:
+        return score + ply
+    return score
+
+
+def rotate_entry(entry, size) -> tuple:
+    """
+    Maps a transposition entry to the rotated, color-swapped position (see Board.canonical_key).
+
+    The mapping is its own inverse, so it converts entries both into and out of the
+    canonical position's frame.
+    """
+    depth, score, bound, move = entry
+    return depth, -score, _ROTATED_BOUND[bound], rotate_move(move, size) if move is not None else None
+
+
+def is_quiet(board, move) -> bool:
+    """
+    Checks whether a move neither captures nor crowns a piece.
+    """
+    if abs(move[1][0] - move[0][0]) == 2:
+        return False
+    piece = board.board[move[0][0]][move[0][1]]
+    return not board.promotes(piece, move[-1][0])
+
+
+def order_moves(board, moves, tt_move=None) -> list:
+    """
+    Orders moves so the most promising are searched first: the transposition table move,
+    then longer capture chains, then promotions, then the remaining quiet moves.
+
+    Returns:
+        list: The reordered moves.
+    """
+    def priority(move):
+        if move == tt_move:
+            return 0
+        if abs(move[1][0] - move[0][0]) == 2:
+            return 1 - len(move) / 100  # Capture more pieces first
+        return 2 if not is_quiet(board, move) else 3
+
+    return sorted(moves, key=priority)
+
+
+def minimax(board, depth, alpha, beta, maximizing_player, tt=None, ply=0, options=None):
     """
     Minimax algorithm with alpha-beta pruning to find the optimal move.
 
@@ -22,49 +257,143 @@ def minimax(board, depth, alpha, beta, maximizing_player):
         depth (int): Remaining depth to evaluate.
         alpha (float): Best already explored option along the path to the root for the maximizer.
         beta (float): Best already explored option along the path to the root for the minimizer.
-        maximizing_player (bool): True if it's AI's turn (white), False for the player (black).
+        maximizing_player (bool): True if it's white's turn, False for black.
+        tt (dict-like or None): Transposition table mapping Board.canonical_key to
+            (depth, score, bound, best_move) for the canonical position. Scores are white's
+            evaluation; bound is EXACT, LOWER or UPPER.
+        ply (int): Distance from the root of the search.
+        options (SearchOptions or None): Selective-search features; None searches full width.
 
     Returns:
         tuple: (evaluation score, best move)
-            - evaluation score (int): Numerical value of board state.
-            - best move (tuple): Best move as ((start_row, start_col), (end_row, end_col)), or None.
+            - evaluation score (float): Numerical value of board state; WIN - n (or -(WIN - n))
+              when white (or black) captures every piece n plies from the root.
+            - best move (tuple): Best move as ((start_row, start_col), ..., (end_row, end_col)), or None.
+    """
+    score, best_move, _ = _search(board, depth, alpha, beta, maximizing_player, tt, ply, options)
+    return score, best_move
+
+
+def _search(board, depth, alpha, beta, maximizing_player, tt, ply, options):
+    """
+    The recursion behind minimax.
+
+    Returns:
+        tuple: (evaluation score, best move, history dependent), where history dependent is
+            True if the score relies on a repetition draw below this node. Such scores hold
+            only for the game the board came from, so they are not stored in the
+            transposition table, which may be shared across games and sessions.
     """
-    if depth == 0 or board.game_over():
-        # Base case: reached depth limit or game is over
-        return board.evaluate_board(), None
+    if options is not None:
+        options.count_node()
+
+    if ply > 0 and board.is_repetition():
+        # A repeated position is a draw: either side can keep repeating it
+        return 0, None, True
+
+    if board.game_over():
+        # The side with pieces left has won
+        return (WIN - ply if board.white_pieces else ply - WIN), None, False
+
+    if depth == 0:
+        # Base case: reached depth limit
+        return board.evaluate_board(), None, False
 
     color = 'white' if maximizing_player else 'black'  # Determine player color
     best_move = None
     moves = board.get_all_moves(color)  # List of possible legal moves
 
     if not moves:
-        # No legal moves available, return neutral score
-        return 0, None
-
-    if maximizing_player:
-        max_eval = float('-inf')
-        for move in moves:
-            new_board = board.copy()
-            new_board.move_piece(*move)
-            eval, _ = minimax(new_board, depth - 1, alpha, beta, False)
-            if eval > max_eval:
-                max_eval = eval
+        # No legal moves available: a draw (see Board.draw)
+        return 0, None, False
+
+    # Mate-distance pruning: no result from here beats a win on the next ply
+    fastest = WIN - ply - 1
+    if alpha >= fastest:
+        return fastest, None, False
+    if beta <= -fastest:
+        return -fastest, None, False
+    alpha, beta = max(alpha, -fastest), min(beta, fastest)
+
+    key = None
+    rotated = False
+    tt_move = None
+    alpha_orig, beta_orig = alpha, beta
+    if tt is not None:
+        key, rotated = board.canonical_key()
+        entry = tt.get(key)
+        if entry is not None and rotated:
+            entry = rotate_entry(entry, len(board.board))
+        if entry is not None and entry[3] is not None and entry[3] not in moves:
+            entry = None  # Stale or colliding entry: its move is illegal here
+        if entry is not None:
+            entry_depth, score, bound, tt_move = entry
+            score = _score_from_tt(score, ply)
+            if entry_depth >= depth:
+                if bound == EXACT:
+                    return score, tt_move, False
+                if bound == LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if beta <= alpha:
+                    return score, tt_move, False
+    moves = order_moves(board, moves, tt_move)
+
+    options = options or _FULL_WIDTH
+    static_eval = board.evaluate_board() if options.futility and depth == 1 else None
+
+    best_eval = float('-inf') if maximizing_player else float('inf')
+    history_dependent = False
+    for index, move in enumerate(moves):
+        quiet = is_quiet(board, move)
+
+        if static_eval is not None and quiet:
+            # Futility pruning: a quiet move at the frontier leaves the evaluation roughly unchanged
+            hopeless = (static_eval + options.futility_margin <= alpha if maximizing_player
+                        else static_eval - options.futility_margin >= beta)
+            if hopeless:
+                if best_move is None or (static_eval > best_eval if maximizing_player else static_eval < best_eval):
+                    best_eval, best_move = static_eval, move
+                continue
+
+        new_board = board.copy()
+        new_board.move_piece(move[0], move[-1], path=move)
+
+        reduce = (options.lmr and quiet and depth >= options.lmr_min_depth
+                  and index >= options.lmr_full_moves and move != tt_move)
+        eval, _, repeated = _search(new_board, depth - 2 if reduce else depth - 1, alpha, beta,
+                                    not maximizing_player, tt, ply + 1, options)
+        history_dependent = history_dependent or repeated
+        if reduce and options.research and (eval > alpha if maximizing_player else eval < beta):
+            # The reduced search failed high: verify at full depth
+            eval, _, repeated = _search(new_board, depth - 1, alpha, beta, not maximizing_player, tt, ply + 1,
+                                        options)
+            history_dependent = history_dependent or repeated
+
+        if maximizing_player:
+            if eval > best_eval:
+                best_eval = eval
                 best_move = move
             alpha = max(alpha, eval)
-            if beta <= alpha:
-                break  # Prune the search tree
-        return max_eval, best_move
-
-    else:
-        min_eval = float('inf')
-        for move in moves:
-            new_board = board.copy()
-            new_board.move_piece(*move)
-            eval, _ = minimax(new_board, depth - 1, alpha, beta, True)
-            if eval < min_eval:
-                min_eval = eval
+        else:
+            if eval < best_eval:
+                best_eval = eval
                 best_move = move
             beta = min(beta, eval)
-            if beta <= alpha:
-                break  # Prune the search tree
-        return min_eval, best_move
+        if beta <= alpha:
+            break  # Prune the search tree
+
+    if tt is not None and not history_dependent:
+        if best_eval <= alpha_orig:
+            bound = UPPER
+        elif best_eval >= beta_orig:
+            bound = LOWER
+        else:
+            bound = EXACT
+        entry = (depth, _score_to_tt(best_eval, ply), bound, best_move)
+        tt[key] = rotate_entry(entry, len(board.board)) if rotated else entry
+    return best_eval, best_move, history_dependent
+
+
+_FULL_WIDTH = SearchOptions()
@@ -0,0 +1,313 @@
+"""
+Persistent search cache shared between sessions and engine processes.
+
+Usage:
+    python search_cache.py stats search_cache.sqlite
+    python search_cache.py compact search_cache.sqlite --max-entries 100000
+"""
+from evaluation import weights_fingerprint
+import argparse
+import atexit
+import json
+import queue
+import sqlite3
+import threading
+import time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_cache (
+    size INTEGER NOT NULL,
+    hash INTEGER NOT NULL,
+    depth INTEGER NOT NULL,
+    score REAL NOT NULL,
+    bound INTEGER NOT NULL,
+    best_move TEXT,
+    updated REAL NOT NULL,
+    PRIMARY KEY (size, hash)
+)
+"""
+
+# Keep the deeper result when two processes store the same position
+_UPSERT = """
+INSERT INTO search_cache (size, hash, depth, score, bound, best_move, updated)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (size, hash) DO UPDATE SET
+    depth = excluded.depth, score = excluded.score, bound = excluded.bound,
+    best_move = excluded.best_move, updated = excluded.updated
+WHERE excluded.depth >= search_cache.depth
+"""
+
+_META_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+)
+"""
+
+_BUSY_TIMEOUT = 30.0
+
+# Bump when the meaning of stored entries changes (keys, score scale, terminal scores)
+FORMAT_VERSION = 2
+
+
+def fingerprint() -> str:
+    """
+    Identifies what the stored scores depend on: the entry format and the evaluation weights.
+    """
+    return f"{FORMAT_VERSION}:{weights_fingerprint()}"
+
+
+def _connect(path) -> sqlite3.Connection:
+    """Opens a connection configured for concurrent use by several processes."""
+    connection = sqlite3.connect(path, timeout=_BUSY_TIMEOUT)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.execute(_SCHEMA)
+    connection.execute(_META_SCHEMA)
+    return connection
+
+
+def _check_fingerprint(connection, expected) -> bool:
+    """
+    Clears the cache if its entries were computed with other weights or another format.
+
+    Returns:
+        bool: True if stale entries were deleted.
+    """
+    row = connection.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+    if row is not None and row[0] == expected:
+        return False
+    with connection:
+        connection.execute("DELETE FROM search_cache")
+        connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('fingerprint', ?)", (expected,))
+    return row is not None
+
+
+def _to_signed(h) -> int:
+    """Maps an unsigned 64-bit hash onto sqlite's signed INTEGER range."""
+    return h - (1 << 64) if h >= (1 << 63) else h
+
+
+def _to_unsigned(h) -> int:
+    return h + (1 << 64) if h < 0 else h
+
+
+def _encode_move(move):
+    return json.dumps(move) if move is not None else None
+
+
+def _decode_move(text):
+    return tuple(tuple(square) for square in json.loads(text)) if text else None
+
+
+class SearchCache:
+    """
+    Transposition entries that survive between games, backed by sqlite.
+
+    The cache behaves like the dictionary used as a transposition table by minimax: keys
+    are Board.canonical_key values, (board size, canonical hash), and values are
+    (depth, score, bound, best_move).
+    Entries are read from disk on first access and new entries are written back by a
+    background thread whenever flush_async is called. The file records the fingerprint()
+    of the weights its scores were computed with; entries from other weights are dropped.
+
+    Attributes:
+        path (str): The sqlite database file.
+        max_entries (int): Size cap; older shallow entries are evicted beyond it.
+        min_depth (int): Entries searched shallower than this are not persisted.
+    """
+
+    def __init__(self, path, max_entries=500_000, min_depth=2):
+        self.path = path
+        self.max_entries = max_entries
+        self.min_depth = min_depth
+        self.fingerprint = fingerprint()
+        self._entries = None
+        self._dirty = {}
+        self._load_lock = threading.Lock()
+        self._loader = None
+        self._writes = queue.Queue()
+        self._writer = None
+        atexit.register(self.close)
+
+    def preload(self):
+        """
+        Starts loading the cache in the background so the first search does not wait for it.
+        """
+        with self._load_lock:
+            if self._entries is None and self._loader is None:
+                self._loader = threading.Thread(target=self._ensure_loaded, daemon=True)
+                self._loader.start()
+
+    def _ensure_loaded(self) -> dict:
+        """Reads the whole database into memory once and returns the entries."""
+        if self._entries is not None:
+            return self._entries
+        with self._load_lock:
+            if self._entries is None:
+                entries = {}
+                connection = _connect(self.path)
+                try:
+                    _check_fingerprint(connection, self.fingerprint)
+                    rows = connection.execute(
+                        "SELECT size, hash, depth, score, bound, best_move FROM search_cache")
+                    for size, h, depth, score, bound, best_move in rows:
+                        entries[(size, _to_unsigned(h))] = (depth, score, bound, _decode_move(best_move))
+                finally:
+                    connection.close()
+                self._entries = entries
+        return self._entries
+
+    def __len__(self):
+        return len(self._ensure_loaded())
+
+    def __contains__(self, key):
+        return key in self._ensure_loaded()
+
+    def get(self, key, default=None):
+        """
+        Returns:
+            tuple or None: (depth, score, bound, best_move) for the position, if cached.
+        """
+        return self._ensure_loaded().get(key, default)
+
+    def __setitem__(self, key, entry):
+        entries = self._ensure_loaded()
+        entries.pop(key, None)
+        entries[key] = entry
+        if len(entries) > self.max_entries:
+            del entries[next(iter(entries))]  # Oldest insertion
+        if entry[0] >= self.min_depth:
+            self._dirty[key] = entry
+
+    def flush_async(self):
+        """
+        Hands the entries stored since the last flush to the background writer.
+        """
+        if not self._dirty:
+            return
+        batch, self._dirty = self._dirty, {}
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, daemon=True)
+            self._writer.start()
+        self._writes.put(batch)
+
+    def flush(self):
+        """
+        Writes all pending entries and waits until they are on disk.
+        """
+        self.flush_async()
+        if self._writer is not None:
+            self._writes.join()
+
+    def close(self):
+        """Flushes pending entries and stops the background writer."""
+        self.flush()
+        if self._writer is not None:
+            self._writes.put(None)
+            self._writer.join()
+            self._writer = None
+
+    def _write_loop(self):
+        connection = _connect(self.path)
+        try:
+            while True:
+                batch = self._writes.get()
+                try:
+                    if batch is None:
+                        return
+                    self._write_batch(connection, batch)
+                finally:
+                    self._writes.task_done()
+        finally:
+            connection.close()
+
+    def _write_batch(self, connection, batch):
+        now = time.time()
+        rows = [
+            (size, _to_signed(h), depth, score, bound, _encode_move(best_move), now)
+            for (size, h), (depth, score, bound, best_move) in batch.items()
+        ]
+        _check_fingerprint(connection, self.fingerprint)  # Another process may have other weights
+        with connection:
+            connection.executemany(_UPSERT, rows)
+        count = connection.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+        if count > self.max_entries:
+            evict(connection, self.max_entries)
+
+
+def evict(connection, max_entries) -> int:
+    """
+    Deletes entries beyond max_entries, dropping the shallowest and least recently
+    updated ones first.
+
+    Returns:
+        int: Number of deleted entries.
+    """
+    with connection:
+        cursor = connection.execute(
+            """
+            DELETE FROM search_cache WHERE rowid IN (
+                SELECT rowid FROM search_cache ORDER BY depth ASC, updated ASC
+                LIMIT max(0, (SELECT COUNT(*) FROM search_cache) - ?)
+            )
+            """,
+            (max_entries,),
+        )
+    return cursor.rowcount
+
+
+def compact(path, max_entries) -> int:
+    """
+    Evicts entries beyond max_entries and rewrites the database file to reclaim space.
+
+    Returns:
+        int: Number of deleted entries.
+    """
+    connection = _connect(path)
+    try:
+        deleted = evict(connection, max_entries)
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        connection.execute("VACUUM")
+        return deleted
+    finally:
+        connection.close()
+
+
+def stats(path) -> dict:
+    """
+    Returns:
+        dict: Entry count, deepest stored depth, entry count per board size and the
+        fingerprint of the weights the entries were computed with.
+    """
+    connection = _connect(path)
+    try:
+        count, max_depth = connection.execute("SELECT COUNT(*), MAX(depth) FROM search_cache").fetchone()
+        sizes = dict(connection.execute("SELECT size, COUNT(*) FROM search_cache GROUP BY size"))
+        row = connection.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        return {"entries": count, "max_depth": max_depth, "sizes": sizes,
+                "fingerprint": row[0] if row else None}
+    finally:
+        connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    stats_parser = commands.add_parser('stats', help="show cache statistics")
+    stats_parser.add_argument('path')
+
+    compact_parser = commands.add_parser('compact', help="evict entries and shrink the file")
+    compact_parser.add_argument('path')
+    compact_parser.add_argument('--max-entries', type=int, default=500_000)
+
+    args = parser.parse_args()
+    if args.command == 'stats':
+        print(stats(args.path))
+    elif args.command == 'compact':
+        print(f"Deleted {compact(args.path, args.max_entries)} entries")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,454 @@
+"""
+asyncio game server: many concurrent games sharing one pool of engine processes.
+
+Clients send one JSON object per line and receive one JSON reply per line. Every
+request may carry an "id" that is echoed in its reply, so requests can be pipelined.
+
+    {"op": "new_game", "board": "8x8"}                 -> {"game_id": "..."}
+    {"op": "move", "game_id": "...", "path": [[5, 0], [4, 1]]}
+    {"op": "ai_move", "game_id": "...", "time": 1.0, "depth": 12}
+                                                       -> {"move": [[2, 1], [3, 0]], "nodes": ...}
+    {"op": "state", "game_id": "..."}
+    {"op": "close", "game_id": "..."}
+    {"op": "stats"}                                    -> queue depth, latency percentiles
+
+AI move requests are queued per game and dispatched round-robin across games, at most
+one per game and one per worker process at a time, so a busy game cannot starve the
+others. Each request's time budget covers its queue wait plus its search, and is capped
+at --max-time seconds since a running search holds its worker until it finishes. Every
+engine process keeps its caches within --max-cache-mb and searches at most --max-nodes
+per move. Games are closed when the connection that created them is closed.
+
+Usage:
+    python server.py --port 8765
+    python server.py --unix /tmp/checkers.sock --workers 4 --max-cache-mb 64
+"""
+from Board import Board
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from minimax import EngineConfig, get_ai_move
+import argparse
+import asyncio
+import json
+import math
+import os
+import time
+import uuid
+
+DEFAULT_TIME_BUDGET = 1.0
+DEFAULT_MAX_TIME = 10.0
+MIN_SEARCH_TIME = 0.05
+MAX_DEPTH = 20
+
+
+_worker_config = None
+
+
+def _init_worker(max_cache_bytes, max_nodes):
+    global _worker_config
+    _worker_config = EngineConfig(max_cache_bytes=max_cache_bytes, max_nodes=max_nodes)
+
+
+def _search(board, depth, time_limit):
+    """
+    Runs in a worker process.
+
+    Returns:
+        tuple: (best move, EngineConfig.last_report)
+    """
+    move = get_ai_move(board, depth=depth, time_limit=time_limit, config=_worker_config)
+    return move, _worker_config.last_report
+
+
+def percentile(values, fraction):
+    """
+    Returns the nearest-rank percentile of a non-empty sorted list.
+    """
+    index = min(len(values) - 1, max(0, math.ceil(fraction * len(values)) - 1))
+    return values[index]
+
+
+class RequestError(Exception):
+    """A client request that cannot be served; reported back as {"error": message}."""
+
+
+def _number(request, name, default, kind, minimum):
+    """
+    Reads a numeric request field.
+
+    Raises:
+        RequestError: If the field is not a finite number of the given kind (int or float)
+            of at least `minimum`.
+    """
+    value = request.get(name, default)
+    types = (int, float) if kind is float else int
+    if isinstance(value, bool) or not isinstance(value, types) or not minimum <= value < math.inf:
+        raise RequestError(f"{name} must be {'a number' if kind is float else 'an integer'} >= {minimum}")
+    return value
+
+
+class Session:
+    """
+    One game hosted by the server.
+
+    Attributes:
+        board (Board): The game state.
+        pending (deque): Queued AI move requests as (future, depth, budget, enqueued time).
+        running (bool): Whether an AI move for this game is being searched.
+    """
+
+    def __init__(self, board_size):
+        self.board = Board(board=board_size)
+        self.pending = deque()
+        self.running = False
+
+
+class EngineServer:
+    """
+    Hosts game sessions and schedules their AI searches on a shared process pool.
+
+    Attributes:
+        workers (int): Size of the process pool.
+        max_cache_bytes (int or None): Cache memory budget of each engine process.
+        max_nodes (int or None): Node budget of each AI move.
+        max_time (float): Largest time budget, in seconds, an AI move request may ask for.
+        max_queue (int): Maximum number of queued AI requests across all games.
+        sessions (dict): Game id to Session.
+    """
+
+    def __init__(self, workers=None, max_cache_bytes=None, max_nodes=None, max_time=DEFAULT_MAX_TIME,
+                 max_queue=1000, latency_window=1000):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_cache_bytes = max_cache_bytes
+        self.max_nodes = max_nodes
+        self.max_time = max_time
+        self.max_queue = max_queue
+        self.sessions = {}
+        self._pool = None
+        self._ready = deque()  # Sessions with queued requests, in round-robin order
+        self._wakeup = None
+        self._dispatcher = None
+        self._in_flight = 0
+        self._queued = 0
+        self._completed = 0
+        self._latencies = deque(maxlen=latency_window)
+
+    async def start(self):
+        """Starts the process pool and the dispatcher task."""
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                         initargs=(self.max_cache_bytes, self.max_nodes))
+        self._wakeup = asyncio.Event()
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def stop(self):
+        """Cancels the dispatcher and shuts the pool down."""
+        if self._dispatcher:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    async def serve_tcp(self, host='127.0.0.1', port=8765):
+        """Starts a TCP listener and returns the asyncio server."""
+        return await asyncio.start_server(self.handle_client, host, port)
+
+    async def serve_unix(self, path):
+        """Starts a Unix socket listener and returns the asyncio server."""
+        return await asyncio.start_unix_server(self.handle_client, path)
+
+    async def handle_client(self, reader, writer):
+        """
+        Reads JSON lines from one connection; each request is handled concurrently.
+
+        Once the client stops sending, the outstanding replies are sent and the games the
+        connection created are closed.
+        """
+        tasks = set()
+        created = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.create_task(self._reply(line, writer, created))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            for game_id in created:
+                self._close_session(game_id)
+            writer.close()
+
+    async def _reply(self, line, writer, created=None):
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise RequestError("Request must be a JSON object")
+            request_id = request.get("id")
+            response = await self.handle(request, created)
+        except json.JSONDecodeError as e:
+            response = {"error": f"Invalid JSON: {e}"}
+        except RequestError as e:
+            response = {"error": str(e)}
+        except Exception as e:
+            # Never leave the client waiting for a reply
+            response = {"error": f"Internal error: {type(e).__name__}: {e}"}
+        if request_id is not None:
+            response["id"] = request_id
+        writer.write(json.dumps(response).encode() + b'\n')
+        await writer.drain()
+
+    async def handle(self, request, created=None) -> dict:
+        """
+        Executes one request.
+
+        Args:
+            request (dict): The decoded request.
+            created (set or None): Game ids created by the requesting connection; new
+                games are added to it.
+
+        Returns:
+            dict: The reply.
+
+        Raises:
+            RequestError: If the request is invalid.
+        """
+        op = request.get("op")
+        if op == "new_game":
+            try:
+                session = Session(request.get("board", '8x8'))
+            except ValueError as e:
+                raise RequestError(str(e))
+            game_id = uuid.uuid4().hex
+            self.sessions[game_id] = session
+            if created is not None:
+                created.add(game_id)
+            return {"game_id": game_id, **self._state(session)}
+        if op == "stats":
+            return self.stats()
+
+        session = self._session(request)
+        if op == "state":
+            return self._state(session)
+        if op == "move":
+            return self._player_move(session, request.get("path"))
+        if op == "ai_move":
+            return await self._ai_move(session, request)
+        if op == "close":
+            if session.pending or session.running:
+                raise RequestError("AI move in progress")
+            self._close_session(request["game_id"])
+            return {"closed": True}
+        raise RequestError(f"Unknown op {op!r}")
+
+    def _close_session(self, game_id):
+        """
+        Removes a game. Its queued AI requests are answered with an error; a search
+        already running finishes in its worker.
+        """
+        session = self.sessions.pop(game_id, None)
+        if session is None:
+            return
+        for future, *_ in session.pending:
+            future.set_exception(RequestError("Game closed"))
+        self._queued -= len(session.pending)
+        session.pending.clear()
+        if session in self._ready:
+            self._ready.remove(session)
+
+    def _session(self, request) -> Session:
+        game_id = request.get("game_id")
+        session = self.sessions.get(game_id) if isinstance(game_id, str) else None
+        if session is None:
+            raise RequestError("Unknown game_id")
+        return session
+
+    def _state(self, session) -> dict:
+        board = session.board
+        return {
+            "board": [[str(piece) if piece else None for piece in row] for row in board.board],
+            "to_move": 'black' if board.last_move_color == 'white' else 'white',
+        }
+
+    def _player_move(self, session, path) -> dict:
+        if session.pending or session.running:
+            raise RequestError("AI move in progress")
+        size = len(session.board.board)
+        if not (isinstance(path, list) and len(path) >= 2 and all(
+                isinstance(square, list) and len(square) == 2
+                and all(isinstance(i, int) and not isinstance(i, bool) and 0 <= i < size for i in square)
+                for square in path)):
+            raise RequestError("path must be a list of at least two [row, col] squares on the board")
+        path = tuple(tuple(square) for square in path)
+        start, end = path[0], path[-1]
+        result = session.board.move_piece(start, end, path=path if len(path) > 2 else None)
+        if not result["moved"]:
+            raise RequestError("Illegal move")
+        return {"move": result["path"], "game_over": result["game_over_text"]}
+
+    async def _ai_move(self, session, request) -> dict:
+        if self._queued >= self.max_queue:
+            raise RequestError("Server busy")
+        budget = min(float(_number(request, "time", DEFAULT_TIME_BUDGET, float, 0)), self.max_time)
+        depth = min(_number(request, "depth", MAX_DEPTH, int, 1), MAX_DEPTH)
+        enqueued = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+
+        if not session.pending and not session.running:
+            self._ready.append(session)
+        session.pending.append((future, depth, budget, enqueued))
+        self._queued += 1
+        self._wakeup.set()
+
+        move, report = await future
+        latency = time.monotonic() - enqueued
+        self._latencies.append(latency)
+        usage = {"latency": latency, "nodes": report["nodes"], "depth": report["depth"], "rss": report["rss"]}
+        if move is None:
+            return {"move": None, "game_over": None, **usage}
+        result = session.board.move_piece(move[0], move[-1], path=move)
+        return {"move": result["path"], "game_over": result["game_over_text"], **usage}
+
+    async def _dispatch(self):
+        """
+        Submits queued requests to the pool, one game at a time in round-robin order.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            while not self._ready or self._in_flight >= self.workers:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+
+            session = self._ready.popleft()
+            future, depth, budget, enqueued = session.pending.popleft()
+            self._queued -= 1
+            session.running = True
+            self._in_flight += 1
+
+            remaining = max(MIN_SEARCH_TIME, budget - (time.monotonic() - enqueued))
+            job = loop.run_in_executor(self._pool, _search, session.board, depth, remaining)
+            job.add_done_callback(lambda job, session=session, future=future: self._finished(job, session, future))
+
+    def _finished(self, job, session, future):
+        self._in_flight -= 1
+        self._completed += 1
+        session.running = False
+        if not future.done():
+            if job.exception() is not None:
+                future.set_exception(RequestError(f"Search failed: {job.exception()}"))
+            else:
+                future.set_result(job.result())
+        if session.pending:
+            self._ready.append(session)  # Back of the queue: other games go first
+        self._wakeup.set()
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: Game count, queue depth, busy workers, completed searches and
+            latency percentiles (seconds) over the recent requests.
+        """
+        latencies = sorted(self._latencies)
+        return {
+            "games": len(self.sessions),
+            "queue_depth": self._queued,
+            "in_flight": self._in_flight,
+            "workers": self.workers,
+            "completed": self._completed,
+            "latency": {
+                name: percentile(latencies, fraction) if latencies else None
+                for name, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99))
+            },
+        }
+
+
+class EngineClient:
+    """
+    Minimal asyncio client for EngineServer, e.g. for tests and load generation.
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self._next_id = 0
+        self._waiting = {}
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, host='127.0.0.1', port=8765):
+        return cls(*await asyncio.open_connection(host, port))
+
+    @classmethod
+    async def connect_unix(cls, path):
+        return cls(*await asyncio.open_unix_connection(path))
+
+    async def call(self, op, **fields) -> dict:
+        """
+        Sends a request and waits for its reply. Several calls may be in flight at once.
+        """
+        self._next_id += 1
+        request_id = self._next_id
+        reply = asyncio.get_running_loop().create_future()
+        self._waiting[request_id] = reply
+        self.writer.write(json.dumps({"op": op, "id": request_id, **fields}).encode() + b'\n')
+        await self.writer.drain()
+        return await reply
+
+    async def _receive(self):
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            response = json.loads(line)
+            reply = self._waiting.pop(response.get("id"), None)
+            if reply is not None and not reply.done():
+                reply.set_result(response)
+        for reply in self._waiting.values():
+            if not reply.done():
+                reply.set_exception(ConnectionError("Server closed the connection"))
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        self._receiver.cancel()
+
+
+async def run(host, port, unix_path, workers, max_cache_bytes=None, max_nodes=None, max_time=DEFAULT_MAX_TIME):
+    engine = EngineServer(workers=workers, max_cache_bytes=max_cache_bytes, max_nodes=max_nodes,
+                          max_time=max_time)
+    await engine.start()
+    server = await (engine.serve_unix(unix_path) if unix_path else engine.serve_tcp(host, port))
+    print(f"Serving on {unix_path or f'{host}:{port}'} with {engine.workers} engine processes")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await engine.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="serve on this Unix socket path instead of TCP")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--max-cache-mb', type=float, default=None, help="cache memory budget per engine process")
+    parser.add_argument('--max-nodes', type=int, default=None, help="node budget per AI move")
+    parser.add_argument('--max-time', type=float, default=DEFAULT_MAX_TIME,
+                        help="largest time budget in seconds an AI move request may ask for")
+    args = parser.parse_args()
+    max_cache_bytes = int(args.max_cache_mb * 2**20) if args.max_cache_mb else None
+    try:
+        asyncio.run(run(args.host, args.port, args.unix, args.workers, max_cache_bytes, args.max_nodes,
+                        args.max_time))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
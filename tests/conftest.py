@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pytest
+
+# The modules live at the top level of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Board import Board
+from checkers import King, Man
+
+
+@pytest.fixture
+def make_board():
+    """
+    Builds a position from {(row, col): code}, where code is 'w' or 'b' for a man and
+    'W' or 'B' for a king.
+    """
+    def make(pieces, size='8x8', to_move='white'):
+        board = Board(size)
+        board.board = [[None] * board.size for _ in range(board.size)]
+        board.white_pieces = []
+        board.black_pieces = []
+        for (row, col), code in pieces.items():
+            color = 'white' if code.lower() == 'w' else 'black'
+            piece = (King if code.isupper() else Man)(color, (row, col), board)
+            board.board[row][col] = piece
+            (board.white_pieces if color == 'white' else board.black_pieces).append(piece)
+        board.last_move_color = 'black' if to_move == 'white' else 'white'
+        board.hash = board.compute_hash()
+        board.rotated_hash = board.compute_hash(rotated=True)
+        board.history = [board.hash]
+        return board
+
+    return make
@@ -0,0 +1,54 @@
+from Board import Board
+from benchmark import PERFT_8X8, perft
+import pytest
+
+
+@pytest.mark.parametrize("depth", range(1, 6))
+def test_perft_matches_published_counts(depth):
+    assert perft(Board(board='8x8'), depth) == PERFT_8X8[depth]
+
+
+def test_multi_jump_is_one_ply_and_removes_every_captured_piece(make_board):
+    board = make_board({(2, 1): 'w', (3, 2): 'b', (5, 4): 'b', (7, 0): 'b'})
+    assert board.get_all_moves('white') == [((2, 1), (4, 3), (6, 5))]
+
+    result = board.move_piece((2, 1), (6, 5))
+    assert result["moved"]
+    assert [piece.position for piece in result["captured"]] == [(3, 2), (5, 4)]
+    assert board.board[3][2] is None and board.board[5][4] is None
+    assert [piece.position for piece in board.black_pieces] == [(7, 0)]
+    assert board.last_move_color == 'white'
+    assert board.hash == board.compute_hash()
+
+
+def test_crowning_ends_a_capture_chain(make_board):
+    # As a king, the piece could go on to capture (6, 5) from (7, 4)
+    board = make_board({(5, 2): 'w', (6, 3): 'b', (6, 5): 'b'})
+    assert board.get_all_moves('white') == [((5, 2), (7, 4))]
+
+    result = board.move_piece((5, 2), (7, 4))
+    assert result["promoted"] is not None and board.board[7][4].is_king
+    assert board.board[6][5] is not None
+    assert board.hash == board.compute_hash()
+
+
+def test_a_capture_by_one_piece_forbids_quiet_moves_of_the_others(make_board):
+    board = make_board({(2, 1): 'w', (2, 5): 'w', (3, 2): 'b', (7, 0): 'b'})
+    assert board.get_all_moves('white') == [((2, 1), (4, 3))]
+
+    result = board.move_piece((2, 5), (3, 6))
+    assert not result["moved"]
+    assert board.board[2][5] is not None and board.last_move_color == 'black'
+
+
+def test_a_capture_chain_can_end_on_its_start_square(make_board):
+    board = make_board({(2, 3): 'W', (3, 4): 'b', (5, 4): 'b', (5, 2): 'b', (3, 2): 'b', (7, 0): 'b'})
+    loops = [move for move in board.get_all_moves('white') if move[-1] == (2, 3)]
+    assert sorted(loops) == [((2, 3), (4, 1), (6, 3), (4, 5), (2, 3)),
+                             ((2, 3), (4, 5), (6, 3), (4, 1), (2, 3))]
+
+    result = board.move_piece((2, 3), (2, 3), path=loops[0])
+    assert result["moved"] and len(result["captured"]) == 4
+    assert board.board[2][3].color == 'white' and board.board[2][3].is_king
+    assert [piece.position for piece in board.black_pieces] == [(7, 0)]
+    assert board.hash == board.compute_hash()
@@ -0,0 +1,64 @@
+from Board import Board
+from cache import LRUCache, MemoryGovernor
+from minimax import EngineConfig, get_ai_move
+
+
+def test_bytes_follow_inserts_replacements_and_evictions():
+    cache = LRUCache(maxsize=2)
+    cache.put((8, 1000), (3, 0.5, 0, ((2, 1), (3, 0))))
+    one = cache.bytes
+    assert one > 0
+    cache.put((8, 1000), (4, 0.25, 0, ((2, 1), (3, 0))))
+    assert cache.bytes == one
+    cache.put((8, 1001), (3, 0.5, 0, ((2, 1), (3, 0))))
+    cache.put((8, 1002), (3, 0.5, 0, ((2, 1), (3, 0))))
+    assert len(cache) == 2 and cache.bytes == 2 * one
+    cache.trim(0)
+    assert cache.bytes == 0
+
+
+def test_governor_evicts_down_to_low_water():
+    first, second = LRUCache(), LRUCache()
+    for i in range(1000):
+        first.put((8, 1000 + i), 0.5)
+        second.put((8, 5000 + i), 0.5)
+    governor = MemoryGovernor(first.bytes, {"first": first, "second": second})
+    governor.enforce()
+    assert sum(governor.usage().values()) <= governor.max_bytes * governor.low_water
+    assert governor.evictions > 0
+
+
+def test_search_stays_within_cache_budget():
+    budget = 256 * 1024
+    config = EngineConfig(max_cache_bytes=budget, max_nodes=3000)
+    peak = 0
+    enforce = config.governor.enforce
+
+    def tracking_enforce():
+        nonlocal peak
+        peak = max(peak, sum(config.governor.usage().values()))
+        enforce()
+
+    config.governor.enforce = tracking_enforce
+    Board.move_cache.clear()
+    try:
+        get_ai_move(Board('8x8'), depth=9, config=config)
+    finally:
+        Board.move_cache.clear()
+    assert config.governor.evictions > 0
+    assert sum(config.last_report["cache_bytes"].values()) <= budget
+    assert peak <= budget * 1.05  # At most one node's entries past the last check
+
+
+def test_budget_follows_a_replaced_move_cache():
+    budget = 256 * 1024
+    config = EngineConfig(max_cache_bytes=budget, max_nodes=3000)
+    original = Board.move_cache
+    Board.move_cache = LRUCache(maxsize=1_000_000)
+    try:
+        get_ai_move(Board('8x8'), depth=9, config=config)
+        assert len(Board.move_cache) > 0
+        assert config.last_report["cache_bytes"]["moves"] == Board.move_cache.bytes
+        assert sum(config.last_report["cache_bytes"].values()) <= budget
+    finally:
+        Board.move_cache = original
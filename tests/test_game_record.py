@@ -0,0 +1,74 @@
+from Board import Board
+from game_record import (GameRecord, GameRecorder, append_binary_log, append_pdn, format_pdn,
+                         iter_binary_log, iter_pdn, parse_pdn_lines, replay, BINARY_MAGIC, BINARY_MAGIC_V1,
+                         _HEADER, _HEADER_V1)
+import pytest
+import random
+
+
+def random_game(rng, board='8x8', max_plies=120, start_rows=None, **tags):
+    position = Board(board=board, start_rows=start_rows)
+    recorder = GameRecorder(board=board, start_rows=start_rows, **tags)
+    for _ in range(max_plies):
+        color = 'black' if position.last_move_color == 'white' else 'white'
+        moves = position.get_all_moves(color)
+        if not moves:
+            break
+        move = rng.choice(moves)
+        recorder.record_move(position.move_piece(move[0], move[-1], path=move))
+        if recorder.finished():
+            break
+    return recorder.record, position
+
+
+@pytest.mark.parametrize("board, start_rows", [('8x8', None), ('10x10', None), ('8x8', 2), ('10x10', 3)])
+def test_pdn_and_binary_round_trip(tmp_path, board, start_rows):
+    rng = random.Random(7)
+    games = [random_game(rng, board=board, start_rows=start_rows, Event=f"Game {i}")[0] for i in range(5)]
+    for record in games:
+        append_pdn(str(tmp_path / "games.pdn"), record)
+        append_binary_log(str(tmp_path / "games.ckg"), record)
+
+    assert list(iter_pdn(str(tmp_path / "games.pdn"))) == games
+    # The binary format keeps no tags
+    assert [(g.board, g.start_rows, g.moves, g.result) for g in iter_binary_log(str(tmp_path / "games.ckg"))] == \
+        [(g.board, g.start_rows, g.moves, g.result) for g in games]
+
+
+@pytest.mark.parametrize("start_rows", [None, 2])
+def test_replay_reaches_the_final_position(start_rows):
+    record, position = random_game(random.Random(3), start_rows=start_rows)
+    assert replay(record).hash == position.hash
+
+
+def test_binary_records_without_start_rows_are_still_read(tmp_path):
+    record = random_game(random.Random(5))[0]
+    data = _HEADER_V1.pack(BINARY_MAGIC_V1, 8, 0, len(record.moves))
+    data += b''.join(bytes([len(move)] + [row * 8 + col for row, col in move]) for move in record.moves)
+    path = tmp_path / "games.ckg"
+    path.write_bytes(data)
+    assert list(iter_binary_log(str(path))) == [GameRecord(record.board, record.moves)]
+
+
+def test_tag_values_with_quotes_and_backslashes_round_trip():
+    record = random_game(random.Random(1), max_plies=6, Event='a "b"', Site='C:\\games\\', Round='\\"')[0]
+    text = format_pdn(record)
+    assert '[Event "a \\"b\\""]' in text
+    assert list(parse_pdn_lines(text.splitlines())) == [record]
+
+
+@pytest.mark.parametrize("size, start_rows", [(0, 0), (2, 0), (7, 0), (18, 0), (8, 4)])
+def test_binary_header_with_invalid_layout_is_rejected(tmp_path, size, start_rows):
+    path = tmp_path / "games.ckg"
+    path.write_bytes(_HEADER.pack(BINARY_MAGIC, size, start_rows, 0, 1) + bytes([2, 1, 2]))
+    with pytest.raises(ValueError):
+        list(iter_binary_log(str(path)))
+
+
+def test_truncated_binary_record_is_ignored(tmp_path):
+    record = random_game(random.Random(2))[0]
+    path = tmp_path / "games.ckg"
+    append_binary_log(str(path), record)
+    append_binary_log(str(path), record)
+    path.write_bytes(path.read_bytes()[:-1])
+    assert list(iter_binary_log(str(path))) == [GameRecord(record.board, record.moves, record.result)]
@@ -0,0 +1,98 @@
+from benchmark import random_opening
+from cache import LRUCache
+from geometry import rotate_move
+from minimax import WIN, EngineConfig, get_ai_move, minimax
+import pytest
+import random
+
+INF = float('inf')
+
+
+def rotated_positions(make_board, count=30, seed=11):
+    """
+    Yields (position, its rotated and color-swapped counterpart) for random 8x8 positions.
+    """
+    rng = random.Random(seed)
+    for _ in range(count):
+        board = random_opening('8x8', rng.randint(1, 30), rng)
+        last = board.size - 1
+        pieces = {}
+        for piece in board.white_pieces + board.black_pieces:
+            code = 'b' if piece.color == 'white' else 'w'  # Colors swap
+            row, col = piece.position
+            pieces[(last - row, last - col)] = code.upper() if piece.is_king else code
+        # The side that just moved is the side to move in the counterpart
+        yield board, make_board(pieces, to_move=board.last_move_color)
+
+
+def test_rotated_hash_is_the_hash_of_the_rotated_position(make_board):
+    for board, rotated in rotated_positions(make_board):
+        assert board.hash == board.compute_hash()  # The incremental hashes are up to date
+        assert board.rotated_hash == board.compute_hash(rotated=True)
+        assert board.rotated_hash == rotated.hash
+        assert board.canonical_key()[0] == rotated.canonical_key()[0]
+
+
+@pytest.mark.parametrize("shared_table", [False, True])
+def test_rotated_position_has_the_negated_score_and_rotated_move(make_board, shared_table):
+    for board, rotated in rotated_positions(make_board, seed=12):
+        if board.game_over():
+            continue
+        white_to_move = board.last_move_color == 'black'
+        tt = LRUCache()
+        score, move = minimax(board, 4, -INF, INF, white_to_move, tt)
+        rotated_score, rotated_move = minimax(rotated, 4, -INF, INF, not white_to_move,
+                                              tt if shared_table else LRUCache())
+        assert rotated_score == pytest.approx(-score)
+        if shared_table:
+            assert rotated_move == rotate_move(move, board.size)
+
+
+def test_repetition_draws_stay_out_of_the_transposition_table(make_board):
+    fresh = make_board({(2, 3): 'W', (4, 3): 'W', (0, 7): 'B'})
+    proven, _ = minimax(fresh, 7, -INF, INF, True)
+    assert proven > WIN - 100
+
+    # The same position in a game where every position white can move to occurred before
+    repeated = fresh.copy()
+    history = []
+    for move in fresh.get_all_moves('white'):
+        child = fresh.copy()
+        child.move_piece(move[0], move[-1], path=move)
+        history += [0, child.hash]
+    repeated.history = history + [fresh.hash]
+    repeated.no_progress_counter = len(repeated.history)
+
+    tt = LRUCache()
+    assert minimax(repeated, 7, -INF, INF, True, tt)[0] == 0
+    assert minimax(fresh, 7, -INF, INF, True, tt)[0] == proven
+
+
+# White to move wins in 7 plies, and in 3 plies
+WIN_IN_7 = {(2, 3): 'W', (4, 3): 'W', (0, 7): 'B'}
+WIN_IN_3 = {(2, 1): 'W', (2, 3): 'W', (0, 1): 'B'}
+
+
+@pytest.mark.parametrize("pieces, plies", [(WIN_IN_7, 7), (WIN_IN_3, 3)])
+def test_forced_win_scores_count_plies_from_the_root(make_board, pieces, plies):
+    board = make_board(pieces)
+    assert minimax(board, 7, -INF, INF, True)[0] == WIN - plies
+    assert minimax(board, 9, -INF, INF, True, LRUCache())[0] == WIN - plies
+    assert minimax(board, 7, -INF, INF, True, ply=3)[0] == WIN - plies - 3
+
+
+@pytest.mark.parametrize("stored_ply, probed_ply", [(0, 3), (3, 0)])
+def test_forced_win_scores_survive_the_table_at_another_ply(make_board, stored_ply, probed_ply):
+    board = make_board(WIN_IN_7)
+    tt = LRUCache()
+    assert minimax(board, 7, -INF, INF, True, tt, ply=stored_ply)[0] == WIN - 7 - stored_ply
+    assert minimax(board, 7, -INF, INF, True, tt, ply=probed_ply)[0] == WIN - 7 - probed_ply
+
+
+@pytest.mark.parametrize("pieces, plies", [(WIN_IN_7, 7), (WIN_IN_3, 3)])
+def test_iterative_deepening_stops_at_the_first_proven_iteration(make_board, pieces, plies):
+    config = EngineConfig()
+    move = get_ai_move(make_board(pieces), depth=20, time_limit=30, config=config)
+    assert move is not None
+    assert config.last_report["depth"] == plies
+    assert config.last_report["seconds"] < 10
@@ -0,0 +1,180 @@
+from server import EngineClient, EngineServer, percentile
+import asyncio
+import json
+import pytest
+import time
+
+
+def run_with_server(scenario, workers=1, **kwargs):
+    """
+    Starts an EngineServer on a free local port, runs scenario(client, engine) and shuts
+    everything down again.
+    """
+    async def main():
+        engine = EngineServer(workers=workers, **kwargs)
+        await engine.start()
+        server = await engine.serve_tcp('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        client = await EngineClient.connect('127.0.0.1', port)
+        try:
+            return await asyncio.wait_for(scenario(client, engine), timeout=60)
+        finally:
+            await client.close()
+            server.close()
+            await server.wait_closed()
+            await engine.stop()
+
+    return asyncio.run(main())
+
+
+def test_new_game_move_and_ai_move():
+    async def scenario(client, engine):
+        game = await client.call('new_game', board='8x8')
+        assert game["to_move"] == 'white'
+        game_id = game["game_id"]
+
+        reply = await client.call('move', game_id=game_id, path=[[2, 1], [3, 0]])
+        assert reply["move"] == [[2, 1], [3, 0]]
+        assert (await client.call('state', game_id=game_id))["to_move"] == 'black'
+
+        reply = await client.call('ai_move', game_id=game_id, time=0.3)
+        assert "error" not in reply
+        assert reply["move"][0][0] in (5, 6, 7)  # A black piece moved
+        assert reply["nodes"] > 0
+        assert (await client.call('state', game_id=game_id))["to_move"] == 'white'
+
+    run_with_server(scenario)
+
+
+def test_player_move_rejected_while_ai_move_pending():
+    async def scenario(client, engine):
+        game_id = (await client.call('new_game'))["game_id"]
+        ai = asyncio.create_task(client.call('ai_move', game_id=game_id, time=0.3))
+        await asyncio.sleep(0.05)
+        reply = await client.call('move', game_id=game_id, path=[[2, 1], [3, 0]])
+        assert reply["error"] == "AI move in progress"
+        assert "error" not in await ai
+
+    run_with_server(scenario)
+
+
+def test_round_robin_across_games():
+    async def scenario(client, engine):
+        first = (await client.call('new_game'))["game_id"]
+        second = (await client.call('new_game'))["game_id"]
+        finished = []
+
+        async def ai_move(game_id, label):
+            reply = await client.call('ai_move', game_id=game_id, time=0.2, depth=3)
+            assert "error" not in reply
+            finished.append(label)
+
+        # The first game queues three requests before the second game queues one
+        tasks = [asyncio.create_task(ai_move(first, f"first-{i}")) for i in range(3)]
+        await asyncio.sleep(0.05)
+        tasks.append(asyncio.create_task(ai_move(second, "second")))
+        await asyncio.gather(*tasks)
+        return finished
+
+    finished = run_with_server(scenario, workers=1)
+    # With one worker, the second game is served before the first game's later requests
+    assert finished.index("second") < finished.index("first-2")
+
+
+def test_time_budget_is_honoured():
+    async def scenario(client, engine):
+        game_id = (await client.call('new_game'))["game_id"]
+        await client.call('ai_move', game_id=game_id, time=0.1, depth=2)  # Start the worker
+        start = time.monotonic()
+        reply = await client.call('ai_move', game_id=game_id, time=0.5)
+        return time.monotonic() - start, reply
+
+    elapsed, reply = run_with_server(scenario)
+    assert "error" not in reply
+    assert reply["depth"] < 20  # Stopped by the clock, not the depth cap
+    assert elapsed < 0.5 + 0.5
+
+
+def test_time_budget_is_capped_by_max_time():
+    async def scenario(client, engine):
+        game_id = (await client.call('new_game'))["game_id"]
+        await client.call('ai_move', game_id=game_id, time=0.1, depth=2)  # Start the worker
+        start = time.monotonic()
+        reply = await client.call('ai_move', game_id=game_id, time=1e9)
+        return time.monotonic() - start, reply
+
+    elapsed, reply = run_with_server(scenario, max_time=0.3)
+    assert "error" not in reply
+    assert elapsed < 0.3 + 0.5
+
+
+def test_games_are_closed_with_their_connection():
+    async def scenario(client, engine):
+        game_ids = [(await client.call('new_game'))["game_id"] for _ in range(2)]
+        client.writer.write(json.dumps({"op": "ai_move", "game_id": game_ids[0], "time": 0.2}).encode() + b'\n')
+        await client.close()
+        while engine.sessions:
+            await asyncio.sleep(0.05)
+        return engine.stats()
+
+    stats = run_with_server(scenario)
+    assert stats["games"] == 0
+    assert stats["queue_depth"] == 0
+
+
+def test_stats_fields():
+    async def scenario(client, engine):
+        game_id = (await client.call('new_game'))["game_id"]
+        await client.call('ai_move', game_id=game_id, time=0.1, depth=2)
+        return await client.call('stats')
+
+    stats = run_with_server(scenario)
+    assert stats["games"] == 1
+    assert stats["queue_depth"] == 0
+    assert stats["in_flight"] == 0
+    assert stats["workers"] == 1
+    assert stats["completed"] == 1
+    assert set(stats["latency"]) == {"p50", "p90", "p99"}
+    assert stats["latency"]["p50"] > 0
+
+
+@pytest.mark.parametrize("fields", [
+    {"op": "ai_move", "time": "abc"},
+    {"op": "ai_move", "time": -1},
+    {"op": "ai_move", "depth": 2.5},
+    {"op": "ai_move", "depth": "deep"},
+    {"op": "move", "path": [[5, 0], [4]]},
+    {"op": "move", "path": [[2, 1], [30, 0]]},
+    {"op": "move", "path": "a3-b4"},
+    {"op": "move", "game_id": [1, 2], "path": [[2, 1], [3, 0]]},
+    {"op": "state", "game_id": {"a": 1}},
+    {"op": "new_game", "board": [8, 8]},
+    {"op": "fly"},
+])
+def test_malformed_requests_get_an_error_reply(fields):
+    async def scenario(client, engine):
+        game_id = (await client.call('new_game'))["game_id"]
+        request = {"game_id": game_id, **fields}
+        return await asyncio.wait_for(client.call(request.pop("op"), **request), timeout=5)
+
+    reply = run_with_server(scenario)
+    assert "error" in reply
+
+
+def test_invalid_json_gets_an_error_reply():
+    async def scenario(client, engine):
+        client._receiver.cancel()  # Read the raw reply lines directly
+        client.writer.write(b'{"op": \n' + json.dumps([1, 2]).encode() + b'\n')
+        await client.writer.drain()
+        return [json.loads(await asyncio.wait_for(client.reader.readline(), timeout=5)) for _ in range(2)]
+
+    replies = run_with_server(scenario)
+    assert all("error" in reply for reply in replies)
+
+
+def test_percentile_nearest_rank():
+    assert percentile([1, 2], 0.5) == 1
+    assert percentile(list(range(1, 11)), 0.5) == 5
+    assert percentile(list(range(1, 11)), 0.9) == 9
+    assert percentile(list(range(1, 11)), 0.99) == 10
+    assert percentile([7], 0.5) == 7
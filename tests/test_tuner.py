@@ -0,0 +1,57 @@
+from Board import Board
+from game_record import GameRecorder, append_pdn
+from multiprocessing import Pool
+import pytest
+import random
+
+np = pytest.importorskip("numpy")
+tuner = pytest.importorskip("tuner")
+
+
+def random_game(rng, max_plies=200):
+    board = Board(board='8x8')
+    recorder = GameRecorder(board='8x8')
+    for _ in range(max_plies):
+        color = 'black' if board.last_move_color == 'white' else 'white'
+        moves = board.get_all_moves(color)
+        if not moves:
+            break
+        move = rng.choice(moves)
+        recorder.record_move(board.move_piece(move[0], move[-1], path=move))
+        if recorder.finished():
+            break
+    return recorder.record
+
+
+@pytest.fixture(scope="module")
+def chunks(tmp_path_factory):
+    workdir = tmp_path_factory.mktemp("tuner")
+    pdn = workdir / "games.pdn"
+    rng = random.Random(4)
+    finished = 0
+    while finished < 12:
+        record = random_game(rng)
+        if record.result != '*':
+            append_pdn(str(pdn), record)
+            finished += 1
+    return tuner.extract_chunks([str(pdn)], str(workdir), chunk_size=100, workers=2)
+
+
+def test_extract_chunks_spills_bounded_chunks(chunks):
+    assert len(chunks) > 1
+    for x, y in tuner.iter_chunks(chunks):
+        assert x.shape == (len(y), len(tuner.FEATURES))
+        assert len(y) <= 100 + 200  # One game may overshoot the chunk size
+
+
+def test_fit_reduces_loss_and_pool_matches_serial(chunks):
+    initial = np.array([tuner.DEFAULT_WEIGHTS[name] for name in tuner.FEATURES], dtype=np.float64)
+    with Pool(2) as pool:
+        k = tuner.fit_scale(chunks, initial, pool=pool)
+        assert k == tuner.fit_scale(chunks, initial)
+        fitted = tuner.fit_weights(chunks, initial, k, epochs=20, log=lambda line: None, pool=pool)
+        serial = tuner.fit_weights(chunks, initial, k, epochs=20, log=lambda line: None)
+
+    assert np.allclose(fitted, serial)
+    assert np.all(np.isfinite(fitted))
+    assert tuner.loss(chunks, fitted, k) < tuner.loss(chunks, initial, k)
@@ -0,0 +1,216 @@
+"""
+Texel-style tuning of the evaluation weights from recorded games.
+
+Every quiet position of every game is labelled with the game's final result (1 for a
+white win, 0.5 for a draw, 0 for a black win), and the weights are fitted so that
+sigmoid(k * evaluation) predicts that label. Features are extracted in parallel and
+spilled to .npy chunk files, so memory use is bounded by the chunk size however many
+games are read; every epoch then streams the chunks back through memory maps, with
+the per-chunk sums computed in parallel worker processes.
+
+Requires NumPy.
+
+Usage:
+    python tuner.py games.pdn games.bin --out weights.json
+"""
+from evaluation import DEFAULT_WEIGHTS, FEATURES, extract_features, save_weights
+from game_record import iter_games, iter_positions
+from multiprocessing import Pool
+import argparse
+import itertools
+import numpy as np
+import os
+import tempfile
+
+_RESULT_LABELS = {'1-0': 1.0, '0-1': 0.0, '1/2-1/2': 0.5}
+
+
+def game_samples(record, skip_opening=6):
+    """
+    Extracts (features, label) rows from one game.
+
+    Positions inside the opening, and positions where the side to move must capture,
+    are skipped: their static evaluation says little about the outcome.
+
+    Args:
+        record (GameRecord): A finished game.
+        skip_opening (int): Number of initial plies to ignore.
+
+    Returns:
+        tuple: (list of feature lists, list of labels)
+    """
+    label = _RESULT_LABELS.get(record.result)
+    rows, labels = [], []
+    if label is None:
+        return rows, labels
+    for ply, board in iter_positions(record):
+        if ply < skip_opening:
+            continue
+        color = 'black' if board.last_move_color == 'white' else 'white'
+        moves = board.get_all_moves(color)
+        if not moves or abs(moves[0][1][0] - moves[0][0][0]) == 2:
+            continue  # Terminal or capture pending: not a quiet position
+        rows.append(extract_features(board))
+        labels.append(label)
+    return rows, labels
+
+
+def _game_samples_worker(args):
+    return game_samples(*args)
+
+
+def extract_chunks(paths, workdir, chunk_size=200_000, workers=None, skip_opening=6):
+    """
+    Streams games from the given files and writes their samples as .npy chunk pairs.
+
+    Args:
+        paths (list): PDN files or binary logs.
+        workdir (str): Directory for the chunk files.
+        chunk_size (int): Maximum positions per chunk (and held in memory at once).
+        workers (int or None): Extraction processes; defaults to the number of CPUs.
+        skip_opening (int): Plies ignored at the start of every game.
+
+    Returns:
+        list: (features path, labels path) per chunk.
+    """
+    games = itertools.chain.from_iterable(iter_games(path) for path in paths)
+    tasks = ((record, skip_opening) for record in games)
+    chunks = []
+    rows, labels = [], []
+
+    def spill():
+        index = len(chunks)
+        x_path = os.path.join(workdir, f"x_{index:05d}.npy")
+        y_path = os.path.join(workdir, f"y_{index:05d}.npy")
+        np.save(x_path, np.asarray(rows, dtype=np.float32))
+        np.save(y_path, np.asarray(labels, dtype=np.float32))
+        chunks.append((x_path, y_path))
+        rows.clear()
+        labels.clear()
+
+    with Pool(workers) as pool:
+        for game_rows, game_labels in pool.imap(_game_samples_worker, tasks, chunksize=16):
+            rows.extend(game_rows)
+            labels.extend(game_labels)
+            if len(rows) >= chunk_size:
+                spill()
+    if rows:
+        spill()
+    return chunks
+
+
+def iter_chunks(chunks):
+    """
+    Yields (features, labels) arrays chunk by chunk, memory-mapped from disk.
+    """
+    for x_path, y_path in chunks:
+        yield np.load(x_path, mmap_mode='r'), np.load(y_path, mmap_mode='r')
+
+
+def sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def _chunk_sums(args):
+    """
+    Sums the squared error and its (unscaled) gradient over one chunk.
+
+    Returns:
+        tuple: (squared error, gradient, number of positions)
+    """
+    (x_path, y_path), weights, k = args
+    x, y = np.load(x_path, mmap_mode='r'), np.load(y_path, mmap_mode='r')
+    predicted = sigmoid(k * (x @ weights))
+    error = predicted - y
+    return float(error @ error), (error * predicted * (1.0 - predicted)) @ x, len(y)
+
+
+def _sums(chunks, weights, k, pool=None) -> tuple:
+    """Adds up _chunk_sums over all chunks, in the pool's processes if one is given."""
+    tasks = [(chunk, weights, k) for chunk in chunks]
+    results = pool.imap_unordered(_chunk_sums, tasks) if pool is not None else map(_chunk_sums, tasks)
+    total, gradient, count = 0.0, np.zeros(len(weights)), 0
+    for chunk_total, chunk_gradient, chunk_count in results:
+        total += chunk_total
+        gradient += chunk_gradient
+        count += chunk_count
+    return total, gradient, count
+
+
+def loss(chunks, weights, k, pool=None) -> float:
+    """
+    Mean squared error between the predicted win probability and the game results.
+    """
+    total, _, count = _sums(chunks, np.asarray(weights, dtype=np.float64), k, pool)
+    return total / count if count else 0.0
+
+
+def fit_scale(chunks, weights, candidates=None, pool=None) -> float:
+    """
+    Finds the sigmoid scale k that best fits the current weights, so the fitted weights
+    stay in the same units as the starting ones (one man = 1).
+    """
+    candidates = candidates if candidates is not None else np.linspace(0.05, 3.0, 60)
+    return float(min(candidates, key=lambda k: loss(chunks, weights, k, pool)))
+
+
+def fit_weights(chunks, weights, k, epochs=50, learning_rate=1.0, log=print, pool=None):
+    """
+    Fits the weights by full-batch gradient descent on the mean squared error.
+
+    Each epoch is one streaming pass over the data: the chunks are summed with vectorized
+    NumPy operations, spread over the pool's processes when a pool is given.
+
+    Args:
+        chunks (list): Chunk files from extract_chunks.
+        weights (np.ndarray): Starting weights, one per feature.
+        k (float): Sigmoid scale.
+        epochs (int): Number of passes.
+        learning_rate (float): Step size.
+        log (callable): Receives a progress line after every epoch.
+        pool (multiprocessing.Pool or None): Workers for the per-chunk sums.
+
+    Returns:
+        np.ndarray: The fitted weights.
+    """
+    weights = np.array(weights, dtype=np.float64)
+    for epoch in range(epochs):
+        total, gradient, count = _sums(chunks, weights, k, pool)
+        if not count:
+            break
+        weights -= learning_rate * 2.0 * k * gradient / count
+        log(f"epoch {epoch + 1}: loss {total / count:.6f}")
+    return weights
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('games', nargs='+', help="PDN files or binary game logs")
+    parser.add_argument('--out', default='weights.json')
+    parser.add_argument('--epochs', type=int, default=50)
+    parser.add_argument('--learning-rate', type=float, default=1.0)
+    parser.add_argument('--chunk-size', type=int, default=200_000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--skip-opening', type=int, default=6)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='checkers-tuner-') as workdir:
+        chunks = extract_chunks(args.games, workdir, args.chunk_size, args.workers, args.skip_opening)
+        positions = sum(len(y) for _, y in iter_chunks(chunks))
+        print(f"{positions} positions in {len(chunks)} chunks")
+        if not positions:
+            raise SystemExit("No finished games with quiet positions found")
+
+        initial = np.array([DEFAULT_WEIGHTS[name] for name in FEATURES], dtype=np.float64)
+        with Pool(min(args.workers or os.cpu_count() or 1, len(chunks))) as pool:
+            k = fit_scale(chunks, initial, pool=pool)
+            print(f"k = {k:.3f}, initial loss {loss(chunks, initial, k, pool):.6f}")
+            weights = fit_weights(chunks, initial, k, args.epochs, args.learning_rate, pool=pool)
+
+    fitted = {name: round(float(value), 4) for name, value in zip(FEATURES, weights)}
+    save_weights(args.out, fitted, k=k, positions=positions)
+    print(f"Wrote {args.out}: {fitted}")
+
+
+if __name__ == '__main__':
+    main()
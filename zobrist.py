@@ -0,0 +1,52 @@
+import random
+
+# Fixed seed so hashes are reproducible across processes and sessions
+_SEED = 0x5EED
+_TABLES = {}
+_ROTATED_TABLES = {}
+
+# XORed into the hash when black is to move
+SIDE_KEY = random.Random(_SEED - 1).getrandbits(64)
+
+
+def zobrist_table(size) -> dict:
+    """
+    Returns the Zobrist keys for a board of the given size, generating them on first use.
+
+    Args:
+        size (int): Number of rows (and columns) of the board.
+
+    Returns:
+        dict: Maps (color, is_king) to a size x size grid of 64-bit keys.
+    """
+    table = _TABLES.get(size)
+    if table is None:
+        rng = random.Random(_SEED + size)
+        table = {
+            (color, is_king): [[rng.getrandbits(64) for _ in range(size)] for _ in range(size)]
+            for color in ('white', 'black')
+            for is_king in (False, True)
+        }
+        _TABLES[size] = table
+    return table
+
+
+def rotated_zobrist_table(size) -> dict:
+    """
+    Returns keys that hash a position as its rotated, color-swapped counterpart
+    (see geometry.rotate_square).
+
+    Returns:
+        dict: Same layout as zobrist_table; the key for (color, is_king) at (row, col) is
+        the zobrist_table key of the other color on the rotated square.
+    """
+    table = _ROTATED_TABLES.get(size)
+    if table is None:
+        keys = zobrist_table(size)
+        other = {'white': 'black', 'black': 'white'}
+        table = {
+            (color, is_king): [row[::-1] for row in reversed(keys[(other[color], is_king)])]
+            for color, is_king in keys
+        }
+        _ROTATED_TABLES[size] = table
+    return table